@@ -0,0 +1 @@
+"""Benchmarks of the mixin stack, run with `python -m benchmarks`"""
@@ -0,0 +1,55 @@
+"""
+Run the benchmarks of the mixin stack
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --baseline results.json --threshold 0.1
+"""
+
+import argparse
+import fnmatch
+import sys
+
+from . import harness
+from .scenarios import all_scenarios
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--driver", choices=sorted(harness.DRIVERS), default="client")
+    parser.add_argument("--filter", default="*", help="Glob on the scenario names")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="Path to store the results as json")
+    parser.add_argument("--baseline", help="Path of the results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    scenarios = [
+        scenario
+        for scenario in all_scenarios()
+        if fnmatch.fnmatch(scenario.name, args.filter)
+    ]
+    report = harness.run(scenarios, args.driver, args.iterations, args.rounds)
+
+    for group, layers in report["layers"].items():
+        print(f"\n{group}")
+        for layer, overhead in layers.items():
+            print(f"  {layer:<20} {overhead:>+10.1f}us")
+
+    if args.output:
+        harness.save(report, args.output)
+
+    if args.baseline:
+        if regressions := harness.compare(
+            report, harness.load(args.baseline), args.threshold
+        ):
+            print("\nRegressions:")
+            print("\n".join(f"  {regression}" for regression in regressions))
+            return 1
+        print("\nNo regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Compare a health check answered by a before_request hook with the same check
+answered by the FastPathMiddleware, and the cost of the middleware for the
+other requests
+
+    python -m benchmarks.fast_path
+"""
+
+import argparse
+
+from flask import Flask, request
+
+from flask_mixins import FastPathMiddleware
+
+from .harness import Scenario, run
+
+
+class HealthMiddleware(FastPathMiddleware):
+    static_responses = {"/health": (200, [("Content-Type", "text/plain")], b"ok")}
+
+
+def _build_app(fast_path: bool) -> Flask:
+    app = Flask(__name__)
+
+    if fast_path:
+        HealthMiddleware(app)
+    else:
+
+        @app.before_request
+        def health():
+            if request.path == "/health":
+                return "ok"
+
+    @app.route("/")
+    def index():
+        return "index"
+
+    return app
+
+
+SCENARIOS = [
+    Scenario("health/before_request", lambda: _build_app(False), path="/health"),
+    Scenario("health/fast_path", lambda: _build_app(True), path="/health"),
+    Scenario("index/before_request", lambda: _build_app(False)),
+    Scenario("index/fast_path", lambda: _build_app(True)),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fast_path")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args(argv)
+    run(SCENARIOS, driver="wsgi", iterations=args.iterations, rounds=args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import io
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field
+from importlib.metadata import version
+from typing import Any, Callable, Dict, List
+
+from flask import Flask
+from werkzeug.test import EnvironBuilder
+
+from flask_mixins.testing import ViewClient
+
+
+@dataclass
+class Scenario:
+    name: str
+    build_app: Callable[[], Flask]
+    method: str = "GET"
+    path: str = "/"
+    json: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Scenarios of the same group are compared layer by layer, in order
+    group: str | None = None
+    layer: str | None = None
+
+
+def _client_driver(scenario: Scenario) -> Callable[[], int]:
+    client = scenario.build_app().test_client()
+
+    def call() -> int:
+        return client.open(
+            scenario.path,
+            method=scenario.method,
+            json=scenario.json,
+            headers=scenario.headers,
+        ).status_code
+
+    return call
+
+
+def _wsgi_driver(scenario: Scenario) -> Callable[[], int]:
+    """Call the wsgi app directly, with an environ built once"""
+    app = scenario.build_app()
+    builder = EnvironBuilder(
+        path=scenario.path,
+        method=scenario.method,
+        json=scenario.json,
+        headers=scenario.headers,
+    )
+    environ = builder.get_environ()
+    body = environ["wsgi.input"].read()
+    builder.close()
+    status = []
+
+    def start_response(status_line, headers, exc_info=None):
+        status.append(int(status_line.split(" ", 1)[0]))
+
+    def call() -> int:
+        environ["wsgi.input"] = io.BytesIO(body)
+        status.clear()
+        iterable = app.wsgi_app(dict(environ), start_response)
+        try:
+            for _ in iterable:
+                pass
+        finally:
+            if hasattr(iterable, "close"):
+                iterable.close()
+        return status[0]
+
+    return call
+
+
+def _view_driver(scenario: Scenario) -> Callable[[], int]:
+    """Call the view of the scenario directly, without the wsgi layer"""
+    app = scenario.build_app()
+    (rule,) = (rule for rule in app.url_map.iter_rules() if rule.rule == scenario.path)
+    client = ViewClient(app, rule.endpoint)
+
+    def call() -> int:
+        return client.open(
+            scenario.method, json=scenario.json, headers=scenario.headers
+        ).status_code
+
+    return call
+
+
+DRIVERS = {"client": _client_driver, "wsgi": _wsgi_driver, "view": _view_driver}
+
+
+def run_scenario(
+    scenario: Scenario,
+    driver: str = "client",
+    iterations: int = 200,
+    rounds: int = 5,
+) -> Dict[str, float]:
+    call = DRIVERS[driver](scenario)
+
+    status = call()
+    if status >= 400:
+        raise RuntimeError(f"Scenario {scenario.name} returned {status}")
+
+    for _ in range(min(iterations, 20)):
+        call()
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        timings.append((time.perf_counter() - start) / iterations)
+
+    median = statistics.median(timings)
+    return {
+        "median_us": median * 1e6,
+        "min_us": min(timings) * 1e6,
+        "rps": 1 / median,
+    }
+
+
+def layer_overheads(
+    scenarios: List[Scenario], results: Dict[str, Dict[str, float]]
+) -> Dict[str, Dict[str, float]]:
+    """
+    The overhead of each layer is the difference with the previous scenario of
+    its group, the groups being ordered from the bare view to the full stack.
+    """
+    overheads: Dict[str, Dict[str, float]] = {}
+    previous: Dict[str, Scenario] = {}
+
+    for scenario in scenarios:
+        if not scenario.group or scenario.name not in results:
+            continue
+
+        if (before := previous.get(scenario.group)) is not None:
+            overheads.setdefault(scenario.group, {})[scenario.layer] = (
+                results[scenario.name]["median_us"] - results[before.name]["median_us"]
+            )
+        previous[scenario.group] = scenario
+
+    return overheads
+
+
+def run(
+    scenarios: List[Scenario],
+    driver: str = "client",
+    iterations: int = 200,
+    rounds: int = 5,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = run_scenario(scenario, driver, iterations, rounds)
+        log(
+            f"{scenario.name:<50} {results[scenario.name]['median_us']:>10.1f}us "
+            f"{results[scenario.name]['rps']:>10.0f} req/s"
+        )
+
+    return {
+        "meta": {
+            "driver": driver,
+            "iterations": iterations,
+            "rounds": rounds,
+            "python": platform.python_version(),
+            "flask": version("flask"),
+            "marshmallow": version("marshmallow"),
+        },
+        "results": results,
+        "layers": layer_overheads(scenarios, results),
+    }
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.1
+) -> List[str]:
+    """Return the scenarios slower than the baseline by more than the threshold"""
+    regressions = []
+    for name, result in report["results"].items():
+        if not (reference := baseline.get("results", {}).get(name)):
+            continue
+
+        ratio = result["median_us"] / reference["median_us"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {reference['median_us']:.1f}us -> "
+                f"{result['median_us']:.1f}us (+{(ratio - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def save(report: Dict[str, Any], path: str):
+    with open(path, "w") as fp:
+        json.dump(report, fp, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as fp:
+        return json.load(fp)
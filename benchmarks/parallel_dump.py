@@ -0,0 +1,79 @@
+"""
+Find the crossover point of the parallel dump of large lists
+
+    python -m benchmarks.parallel_dump --workers 4
+"""
+
+import argparse
+import hashlib
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from marshmallow import Schema, fields
+
+from flask_mixins import ResourcesView
+
+from .scenarios import make_items
+
+SIZES = (500, 2000, 5000, 20000, 50000)
+
+
+def _digest(item) -> str:
+    # A CPU heavy custom field
+    value = item.name.encode()
+    for _ in range(20):
+        value = hashlib.sha256(value).digest()
+    return value.hex()
+
+
+class HeavyItemSchema(Schema):
+    id = fields.Int()
+    name = fields.Str()
+    price = fields.Float()
+    digest = fields.Function(_digest)
+
+
+def _time_dump(view: ResourcesView, items: list, rounds: int) -> float:
+    schema = HeavyItemSchema(many=True)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        view.dump_response(schema, items)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e3
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.parallel_dump")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    executors = {
+        "serial": None,
+        "threads": ThreadPoolExecutor(args.workers),
+        "processes": ProcessPoolExecutor(args.workers),
+    }
+
+    print(f"{'items':>8}" + "".join(f"{name:>14}" for name in executors))
+    for size in SIZES:
+        items = make_items(size)
+        timings = []
+        for executor in executors.values():
+            view = ResourcesView()
+            view.dump_executor = executor
+            view.parallel_dump_threshold = 0
+            view.parallel_dump_chunk_size = args.chunk_size
+            timings.append(_time_dump(view, items, args.rounds))
+        print(f"{size:>8}" + "".join(f"{timing:>12.1f}ms" for timing in timings))
+
+    for executor in executors.values():
+        if executor is not None:
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
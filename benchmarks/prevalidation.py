@@ -0,0 +1,89 @@
+"""
+Compare the marshmallow load with and without the structural pre-validation
+
+    python -m benchmarks.prevalidation
+"""
+
+import argparse
+import timeit
+
+from marshmallow import Schema, ValidationError, fields, validate
+
+from flask_mixins.prevalidation import prevalidate
+
+from .scenarios import AuthorSchema
+
+
+class OrderLineSchema(Schema):
+    sku = fields.Str(required=True)
+    quantity = fields.Int(required=True, validate=validate.Range(min=1))
+    price = fields.Decimal(required=True)
+
+
+class OrderSchema(Schema):
+    reference = fields.Str(required=True)
+    customer = fields.Nested(AuthorSchema, required=True)
+    notes = fields.Str(allow_none=True)
+    lines = fields.List(
+        fields.Nested(OrderLineSchema), validate=validate.Length(max=500)
+    )
+
+
+def _line(i):
+    return {"sku": f"sku-{i}", "quantity": i + 1, "price": "9.99"}
+
+
+PAYLOADS = {
+    "valid": {
+        "reference": "order",
+        "customer": {"id": 1, "name": "customer"},
+        "lines": [_line(i) for i in range(100)],
+    },
+    "wrong-type": {
+        "reference": "order",
+        "customer": {"id": 1, "name": "customer"},
+        "lines": [dict(_line(i), sku=i) for i in range(100)],
+    },
+    "missing-key": {"customer": {"id": 1, "name": "customer"}, "lines": []},
+    "oversized-array": {
+        "reference": "order",
+        "customer": {"id": 1, "name": "customer"},
+        "lines": [_line(i) for i in range(5000)],
+    },
+}
+
+
+def _load(schema, data, with_prevalidation):
+    try:
+        if with_prevalidation:
+            prevalidate(schema, data)
+        schema.load(data)
+    except ValidationError:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.prevalidation")
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    schema = OrderSchema()
+    print(f"{'payload':<20}{'load':>14}{'prevalidated':>14}")
+    for name, data in PAYLOADS.items():
+        timings = [
+            min(
+                timeit.repeat(
+                    lambda: _load(schema, data, with_prevalidation),
+                    number=args.number,
+                    repeat=3,
+                )
+            )
+            / args.number
+            * 1e6
+            for with_prevalidation in (False, True)
+        ]
+        print(f"{name:<20}" + "".join(f"{timing:>12.1f}us" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+from flask import Flask, jsonify
+from flask.views import MethodView
+from marshmallow import Schema, fields
+
+from flask_mixins import (
+    JsonifyMixin,
+    PermissionMixin,
+    ResourcesView,
+    SchemaMixin,
+    StatusCodeMixin,
+)
+
+from .harness import Scenario
+
+SIZES = {"small": 1, "large": 1000}
+PERMISSIONS = {"1-permission": 1, "10-permissions": 10}
+
+
+@dataclass
+class Author:
+    id: int
+    name: str
+
+
+@dataclass
+class Item:
+    id: int
+    name: str
+    price: float
+    author: Author
+
+
+class AuthorSchema(Schema):
+    id = fields.Int()
+    name = fields.Str()
+
+
+class FlatItemSchema(Schema):
+    id = fields.Int()
+    name = fields.Str()
+    price = fields.Float()
+
+
+class NestedItemSchema(FlatItemSchema):
+    author = fields.Nested(AuthorSchema)
+
+
+class AllowPermission:
+    def check_permission(self):
+        return
+
+
+def make_items(count: int) -> List[Item]:
+    return [
+        Item(id=i, name=f"item-{i}", price=i / 10, author=Author(i % 10, "author"))
+        for i in range(count)
+    ]
+
+
+def _app(view: type[MethodView]) -> Flask:
+    app = Flask("benchmarks")
+    app.add_url_rule("/", view_func=view.as_view("index"))
+    return app
+
+
+def _layer_views(count: int):
+    """Views from the bare MethodView to the full stack, one layer at a time"""
+    items = make_items(count)
+    dumped = FlatItemSchema(many=True).dump(items)
+
+    class Bare(MethodView):
+        def get(self):
+            return jsonify(dumped)
+
+    class Jsonify(JsonifyMixin, MethodView):
+        def get(self):
+            return dumped
+
+    class StatusCode(JsonifyMixin, StatusCodeMixin, MethodView):
+        def get(self):
+            return dumped
+
+    class Schema_(JsonifyMixin, StatusCodeMixin, SchemaMixin, MethodView):
+        schema = FlatItemSchema
+
+        def get_response_schema_options(self):
+            return {"many": True}
+
+        def get(self):
+            return items
+
+    class Permission(
+        JsonifyMixin, StatusCodeMixin, SchemaMixin, PermissionMixin, MethodView
+    ):
+        schema = FlatItemSchema
+        permissions = (AllowPermission,)
+
+        def get_response_schema_options(self):
+            return {"many": True}
+
+        def get(self):
+            return items
+
+    class Full(ResourcesView):
+        schema = FlatItemSchema
+        permissions = (AllowPermission,)
+
+        def get(self):
+            return items
+
+    return [
+        ("bare", Bare),
+        ("jsonify", Jsonify),
+        ("status_code", StatusCode),
+        ("schema", Schema_),
+        ("permission", Permission),
+        ("resources_view", Full),
+    ]
+
+
+def _resources_view(count: int, permissions: int, schema: type[Schema]):
+    items = make_items(count)
+
+    class View(ResourcesView):
+        pass
+
+    View.schema = schema
+    View.permissions = (AllowPermission,) * permissions
+    View.get = lambda self: items
+    return View
+
+
+def layer_scenarios() -> List[Scenario]:
+    scenarios = []
+    for size, count in SIZES.items():
+        group = f"layers/{size}"
+        for layer, view in _layer_views(count):
+            scenarios.append(
+                Scenario(
+                    name=f"{group}/{layer}",
+                    build_app=lambda view=view: _app(view),
+                    group=group,
+                    layer=layer,
+                )
+            )
+    return scenarios
+
+
+def matrix_scenarios() -> List[Scenario]:
+    scenarios = []
+    for size, count in SIZES.items():
+        for permissions_name, permissions in PERMISSIONS.items():
+            for schema_name, schema in (
+                ("flat", FlatItemSchema),
+                ("nested", NestedItemSchema),
+            ):
+                view = _resources_view(count, permissions, schema)
+                scenarios.append(
+                    Scenario(
+                        name=f"matrix/{size}/{permissions_name}/{schema_name}",
+                        build_app=lambda view=view: _app(view),
+                    )
+                )
+    return scenarios
+
+
+def memo_scenarios() -> List[Scenario]:
+    """Large list sharing 10 authors, with and without the nested dump memo"""
+    authors = [Author(i, f"author-{i}") for i in range(10)]
+    items = [
+        Item(id=i, name=f"item-{i}", price=i / 10, author=authors[i % 10])
+        for i in range(SIZES["large"])
+    ]
+    scenarios = []
+    for memoize in (False, True):
+
+        class View(ResourcesView):
+            schema = NestedItemSchema
+            memoize_nested_dumps = memoize
+
+            def get(self):
+                return items
+
+        scenarios.append(
+            Scenario(
+                name=f"memo/large/{'memoized' if memoize else 'plain'}",
+                build_app=lambda view=View: _app(view),
+            )
+        )
+    return scenarios
+
+
+def all_scenarios() -> List[Scenario]:
+    return layer_scenarios() + matrix_scenarios() + memo_scenarios()
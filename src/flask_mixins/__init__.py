@@ -1,12 +1,43 @@
 from distutils.version import LooseVersion
 
-from .middleware import BaseMiddleware
-from .permissions import BasePermission, Permission
+from .audit import AuditLog, AuditRecord, AuditSink, FileAuditSink, SQLiteAuditSink
+from .deadline import Deadline, DeadlineExceeded
+from .idempotency import (
+    IdempotencyStore,
+    MemoryIdempotencyStore,
+    SQLiteIdempotencyStore,
+)
+from .jobs import ExecutorJobQueue, Job, JobQueue
+from .limits import (
+    ConcurrencyLimit,
+    FileLockBackend,
+    InProcessBackend,
+    RateLimit,
+    RateLimitExceeded,
+    SlidingWindowRateLimit,
+)
+from .memory import MemoryTrackingMiddleware
+from .middleware import BaseMiddleware, FastPathMiddleware, LoadSheddingMiddleware
+from .permissions import (
+    BasePermission,
+    Decision,
+    ObjectPermission,
+    Permission,
+    PermissionDenied,
+)
+from .profiling import ProfilingMiddleware
+from .raw_json import RawJSON, RawJSONField
+from .single_flight import SingleFlight
+from .sync import SyncResult, SyncToken, SyncTokenExpired
+from .view_mixins._utils import DispatchContext, dispatch_context, request_state
+from .view_mixins.deadline_mixin import DeadlineMixin
+from .view_mixins.idempotency_mixin import IdempotencyMixin
 from .view_mixins.misc_mixins import JsonifyMixin, StatusCodeMixin
 from .view_mixins.permission_mixin import PermissionMixin
 from .view_mixins.schema_mixin import SchemaMixin
 from .view_mixins.service_mixin import ServiceMixin
-from .views import ResourcesView, ResourceView
+from .view_mixins.single_flight_mixin import SingleFlightMixin
+from .views import JobStatusView, ResourcesView, ResourceView
 
 __all__ = [
     "JsonifyMixin",
@@ -18,7 +49,46 @@ __all__ = [
     "ResourcesView",
     "BasePermission",
     "Permission",
+    "ObjectPermission",
+    "Decision",
+    "PermissionDenied",
     "BaseMiddleware",
+    "RateLimit",
+    "SlidingWindowRateLimit",
+    "ConcurrencyLimit",
+    "RateLimitExceeded",
+    "InProcessBackend",
+    "FileLockBackend",
+    "DeadlineMixin",
+    "Deadline",
+    "DeadlineExceeded",
+    "LoadSheddingMiddleware",
+    "FastPathMiddleware",
+    "ProfilingMiddleware",
+    "MemoryTrackingMiddleware",
+    "IdempotencyMixin",
+    "IdempotencyStore",
+    "MemoryIdempotencyStore",
+    "SQLiteIdempotencyStore",
+    "JobStatusView",
+    "Job",
+    "JobQueue",
+    "ExecutorJobQueue",
+    "request_state",
+    "DispatchContext",
+    "dispatch_context",
+    "SyncResult",
+    "SyncToken",
+    "SyncTokenExpired",
+    "SingleFlight",
+    "SingleFlightMixin",
+    "RawJSON",
+    "RawJSONField",
+    "AuditLog",
+    "AuditRecord",
+    "AuditSink",
+    "FileAuditSink",
+    "SQLiteAuditSink",
 ]
 
 __version__ = "0.0.7"
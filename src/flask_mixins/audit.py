@@ -0,0 +1,225 @@
+"""
+Audit log of the permission decisions.
+
+The records are appended to a bounded in-memory buffer during the request, and
+written in batches to a sink by a background thread, so that the request never
+waits on the disk or the database. When the buffer is full, the oldest records
+are dropped (and counted), or the request waits for some space, depending on
+the `overflow` policy. The pending records are flushed when the log is closed,
+which happens at exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+GRANTED = "granted"
+DENIED = "denied"
+
+DROP = "drop"
+BLOCK = "block"
+
+
+@dataclass
+class AuditRecord:
+    timestamp: float
+    view: str
+    method: str
+    permission: str
+    outcome: str
+    reason: str | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class AuditSink:
+    def write(self, records: List[AuditRecord]):
+        raise NotImplementedError
+
+    def close(self):
+        return
+
+
+class CallableAuditSink(AuditSink):
+    def __init__(self, func: Callable[[List[AuditRecord]], Any]):
+        self.func = func
+
+    def write(self, records: List[AuditRecord]):
+        self.func(records)
+
+
+class FileAuditSink(AuditSink):
+    """Append the records to a file, as json lines"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def write(self, records: List[AuditRecord]):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(
+            "".join(json.dumps(record.to_dict()) + "\n" for record in records)
+        )
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SQLiteAuditSink(AuditSink):
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Only used by one thread at a time, under the write lock of the log
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS audit ("
+                "timestamp REAL, view TEXT, method TEXT, permission TEXT, "
+                "outcome TEXT, reason TEXT)"
+            )
+        return connection
+
+    def write(self, records: List[AuditRecord]):
+        if self._connection is None:
+            self._connection = self._connect()
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO audit VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        record.timestamp,
+                        record.view,
+                        record.method,
+                        record.permission,
+                        record.outcome,
+                        record.reason,
+                    )
+                    for record in records
+                ],
+            )
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class AuditLog:
+    def __init__(
+        self,
+        sink: AuditSink | Callable[[List[AuditRecord]], Any],
+        capacity: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow: str = DROP,
+    ):
+        if overflow not in (DROP, BLOCK):
+            raise ValueError(f"Unknown overflow policy {overflow}")
+
+        self.sink = sink if isinstance(sink, AuditSink) else CallableAuditSink(sink)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.dropped = 0
+        self._buffer: deque[AuditRecord] = deque()
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        atexit.register(self.close)
+
+    def _ensure_thread(self):
+        # Started lazily, and again in the workers forked after it started
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="flask-mixins-audit", daemon=True
+            )
+            self._thread.start()
+
+    def record(self, record: AuditRecord):
+        with self._condition:
+            if not self._closed:
+                self._ensure_thread()
+                if len(self._buffer) >= self.capacity:
+                    if self.overflow == BLOCK:
+                        self._condition.wait_for(
+                            lambda: len(self._buffer) < self.capacity or self._closed
+                        )
+                    else:
+                        self._buffer.popleft()
+                        self.dropped += 1
+
+            self._buffer.append(record)
+            if self._batch_ready():
+                self._condition.notify_all()
+            closed = self._closed
+
+        if closed:
+            # Written synchronously once the log is closed
+            self.flush()
+
+    def _batch_ready(self) -> bool:
+        return len(self._buffer) >= min(self.batch_size, self.capacity)
+
+    def _write_batch(self) -> bool:
+        # The batch is taken under the write lock, to keep the records in order
+        with self._write_lock:
+            with self._condition:
+                batch = []
+                while self._buffer and len(batch) < self.batch_size:
+                    batch.append(self._buffer.popleft())
+                self._condition.notify_all()
+
+            if not batch:
+                return False
+            try:
+                self.sink.write(batch)
+            except Exception:
+                logger.exception("Failed to write %s audit records", len(batch))
+        return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._batch_ready() or self._closed,
+                    timeout=self.flush_interval,
+                )
+                if self._closed:
+                    return
+            self._write_batch()
+
+    def flush(self):
+        """Write the pending records, in the calling thread"""
+        while self._write_batch():
+            pass
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self.sink.close()
+        atexit.unregister(self.close)
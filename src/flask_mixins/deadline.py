@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import time
+
+from werkzeug.exceptions import GatewayTimeout
+
+
+class DeadlineExceeded(GatewayTimeout):
+    description = "The request deadline was exceeded"
+
+
+class Deadline:
+    __slots__ = ("expires_at",)
+
+    def __init__(self, expires_at: float):
+        # Based on time.monotonic
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_timeout(cls, timeout: float, start: float | None = None) -> Deadline:
+        return cls((time.monotonic() if start is None else start) + timeout)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self):
+        if self.expired:
+            raise DeadlineExceeded()
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f})"
+
+
+def parse_queue_start(value: str) -> float | None:
+    """
+    Parse the queue start set by the proxy (`t=<seconds since epoch>` or a bare
+    timestamp in s, ms or us) into seconds since epoch
+    """
+    value = value.strip()
+    if value.startswith("t="):
+        value = value[2:]
+
+    try:
+        start = float(value)
+    except ValueError:
+        return None
+
+    # Normalise microseconds and milliseconds to seconds
+    if start > 1e14:
+        return start / 1e6
+    if start > 1e11:
+        return start / 1e3
+    return start
+
+
+def check_deadline(view: object):
+    """Abort with a 504 if the view has an expired deadline"""
+    deadline: Deadline | None = getattr(view, "deadline", None)
+    if deadline is not None:
+        deadline.check()
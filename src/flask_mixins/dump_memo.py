@@ -0,0 +1,63 @@
+"""
+Memoization of the nested dumps of a response.
+
+Denormalised lists often reference the same nested objects (the same author for
+many rows), which marshmallow dumps again for every row. The nested fields of a
+schema instance can be patched to dump each distinct object once per nested
+schema, reusing the output (the same dict is then shared between the rows).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from marshmallow import Schema, fields
+
+_PATCHED = "_flask_mixins_memoized"
+
+
+def _patch_field(field: fields.Field, memo: Dict, key: Callable[[Any], Hashable]):
+    if isinstance(field, fields.List):
+        _patch_field(field.inner, memo, key)
+        return
+
+    if not isinstance(field, fields.Nested) or isinstance(field, fields.Pluck):
+        return
+
+    def dump_one(schema: Schema, value: Any) -> Any:
+        memo_key = (id(schema), key(value))
+        if (entry := memo.get(memo_key)) is None:
+            # Keep a reference to the value, so that its id can't be reused
+            entry = memo[memo_key] = (value, schema.dump(value, many=False))
+        return entry[1]
+
+    def _serialize(nested_obj, attr, obj, **kwargs):
+        if nested_obj is None:
+            return None
+
+        schema = field.schema
+        memoize_nested_dumps(schema, key, memo)
+
+        if schema.many or field.many:
+            return [dump_one(schema, value) for value in nested_obj]
+        return dump_one(schema, nested_obj)
+
+    field._serialize = _serialize
+
+
+def memoize_nested_dumps(
+    schema: Schema, key: Callable[[Any], Hashable] = id, memo: Dict | None = None
+) -> Dict[Tuple[int, Hashable], Any]:
+    """
+    Patch the nested fields of the schema instance (and of its nested schemas,
+    as they are used) to share the memo. The key identifies the nested objects,
+    `id` by default, or a primary key for objects loaded more than once.
+    """
+    if getattr(schema, _PATCHED, None) is not None:
+        return getattr(schema, _PATCHED)
+
+    memo = {} if memo is None else memo
+    setattr(schema, _PATCHED, memo)
+    for field in schema.dump_fields.values():
+        _patch_field(field, memo, key)
+    return memo
@@ -0,0 +1,132 @@
+"""
+Eager loading of the relationships dumped by a response schema.
+
+The nested fields (`Nested`, `List(Nested)` and `Pluck`) of a schema are turned
+into a load plan, a tree of the attributes that the dump will traverse, taking
+the `only`/`exclude` projection into account. Applied to a SQLAlchemy query, the
+plan loads each relationship with one query for all the rows (select-in loading
+for the collections, joined loading for the many-to-one), instead of one lazy
+load per row.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List
+
+from marshmallow import Schema, fields
+
+try:
+    from sqlalchemy import inspect as sa_inspect
+    from sqlalchemy.orm import joinedload, selectinload
+except ImportError:
+    sa_inspect = None
+
+# Attribute to the plan of its own nested fields
+LoadPlan = Dict[str, "LoadPlan"]
+
+
+def _nested_field(field: fields.Field) -> fields.Nested | None:
+    while isinstance(field, fields.List):
+        field = field.inner
+    return field if isinstance(field, fields.Nested) else None
+
+
+def _plan(schema: Schema, path: tuple = ()) -> LoadPlan:
+    path = path + (type(schema),)
+    plan: LoadPlan = {}
+    for name, field in schema.dump_fields.items():
+        if (nested := _nested_field(field)) is None:
+            continue
+        # The nested schema has the projection of the parent applied (and
+        # only the plucked field for a Pluck)
+        nested_schema = nested.schema
+        if type(nested_schema) in path:
+            # A schema nesting itself, only its first level is loaded
+            plan[field.attribute or name] = {}
+        else:
+            plan[field.attribute or name] = _plan(nested_schema, path)
+    return plan
+
+
+def _projection(only: Any, exclude: Any) -> tuple:
+    return (frozenset(only) if only is not None else None, frozenset(exclude))
+
+
+def _plan_key(schema: Schema) -> tuple:
+    """
+    The schema class with its projection, and the projections of its nested
+    fields, which have the dotted `only`/`exclude` of the deeper levels
+    """
+    nested = tuple(
+        (name, _projection(nested.only, nested.exclude))
+        for name, field in schema.dump_fields.items()
+        if (nested := _nested_field(field)) is not None
+    )
+    return (type(schema), _projection(schema.only, schema.exclude), nested)
+
+
+_lock = threading.Lock()
+_cache: Dict[tuple, LoadPlan] = {}
+
+
+def get_load_plan(schema: Schema) -> LoadPlan:
+    """Get the load plan of the schema, cached per schema class and projection"""
+    key = _plan_key(schema)
+    if (plan := _cache.get(key)) is None:
+        plan = _plan(schema)
+        with _lock:
+            _cache[key] = plan
+    return plan
+
+
+def load_paths(plan: LoadPlan, prefix: str = "") -> List[str]:
+    """The dotted paths of the plan, ["author", "tags", "tags.creator"]"""
+    paths = []
+    for name, children in plan.items():
+        paths.append(f"{prefix}{name}")
+        paths.extend(load_paths(children, f"{prefix}{name}."))
+    return paths
+
+
+def is_sqlalchemy_query(query: Any) -> bool:
+    """A `Query` or a `select()` of SQLAlchemy"""
+    return (
+        sa_inspect is not None
+        and hasattr(query, "options")
+        and hasattr(query, "column_descriptions")
+    )
+
+
+def _loader_options(entity: Any, plan: LoadPlan, parent: Any = None) -> list:
+    relationships = sa_inspect(entity).relationships
+    options = []
+    for name, children in plan.items():
+        if (relationship := relationships.get(name)) is None:
+            # A column or a property, nothing to load
+            continue
+
+        attribute = getattr(entity, name)
+        loader = selectinload if relationship.uselist else joinedload
+        option = (
+            loader(attribute)
+            if parent is None
+            else getattr(parent, loader.__name__)(attribute)
+        )
+        nested = _loader_options(relationship.mapper.class_, children, option)
+        options.extend(nested or [option])
+    return options
+
+
+def apply_load_plan(query: Any, plan: LoadPlan) -> Any:
+    """Add the loader options of the plan to a SQLAlchemy query"""
+    if not plan or not is_sqlalchemy_query(query):
+        return query
+
+    entity = query.column_descriptions[0]["entity"]
+    if entity is None:
+        return query
+
+    if options := _loader_options(entity, plan):
+        return query.options(*options)
+    return query
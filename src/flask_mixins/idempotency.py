@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from flask import current_app
+from werkzeug import Response
+
+
+@dataclass
+class StoredResponse:
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    # Hash of the request of the response, a retry must send the same request
+    fingerprint: str = ""
+
+    @classmethod
+    def from_response(cls, response: Response, fingerprint: str = "") -> StoredResponse:
+        return cls(
+            status=response.status_code,
+            headers=[
+                (name, value)
+                for name, value in response.headers.items()
+                if name.lower() not in ("content-length", "set-cookie")
+            ],
+            body=response.get_data(),
+            fingerprint=fingerprint,
+        )
+
+    def to_response(self) -> Response:
+        return current_app.response_class(
+            self.body, status=self.status, headers=self.headers
+        )
+
+
+class IdempotencyStore:
+    def get(self, key: str) -> StoredResponse | None:
+        raise NotImplementedError
+
+    def acquire(self, key: str) -> bool:
+        """Mark the key as in flight, False if it already is or is complete"""
+        raise NotImplementedError
+
+    def complete(self, key: str, response: StoredResponse):
+        raise NotImplementedError
+
+    def release(self, key: str):
+        """Forget an in flight key, so that the request can be retried"""
+        raise NotImplementedError
+
+    def wait(self, key: str, timeout: float) -> StoredResponse | None:
+        """Wait for an in flight key to complete"""
+        raise NotImplementedError
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Store of the last `max_entries` responses of the process"""
+
+    _PENDING = object()
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._condition = threading.Condition()
+        self._entries: OrderedDict[str, Tuple[float, object]] = OrderedDict()
+
+    def _get(self, key: str) -> object | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _set(self, key: str, value: object):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> StoredResponse | None:
+        with self._condition:
+            value = self._get(key)
+        return value if isinstance(value, StoredResponse) else None
+
+    def acquire(self, key: str) -> bool:
+        with self._condition:
+            if self._get(key) is not None:
+                return False
+            self._set(key, self._PENDING)
+            return True
+
+    def complete(self, key: str, response: StoredResponse):
+        with self._condition:
+            self._set(key, response)
+            self._condition.notify_all()
+
+    def release(self, key: str):
+        with self._condition:
+            self._entries.pop(key, None)
+            self._condition.notify_all()
+
+    def wait(self, key: str, timeout: float) -> StoredResponse | None:
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._get(key) is not self._PENDING, timeout=timeout
+            )
+            value = self._get(key)
+        return value if isinstance(value, StoredResponse) else None
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """Store shared by the processes of a host, in a local SQLite database"""
+
+    poll_interval = 0.05
+
+    def __init__(self, path: str, ttl: float = 24 * 3600, pending_ttl: float = 60):
+        self.path = path
+        self.ttl = ttl
+        # In flight keys expire sooner, in case the worker died
+        self.pending_ttl = pending_ttl
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS idempotency ("
+                "key TEXT PRIMARY KEY, expires_at REAL, status INTEGER, "
+                "headers TEXT, body BLOB, fingerprint TEXT)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        if (connection := getattr(self._local, "connection", None)) is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            self._local.connection = connection
+        return connection
+
+    def _select(self, key: str) -> tuple | None:
+        with self._connection() as connection:
+            connection.execute(
+                "DELETE FROM idempotency WHERE expires_at < ?", (time.time(),)
+            )
+            return connection.execute(
+                "SELECT status, headers, body, fingerprint FROM idempotency "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+    @staticmethod
+    def _to_response(row: tuple | None) -> StoredResponse | None:
+        if row is None or row[0] is None:
+            return None
+        return StoredResponse(
+            status=row[0],
+            headers=[tuple(header) for header in json.loads(row[1])],
+            body=row[2],
+            fingerprint=row[3] or "",
+        )
+
+    def get(self, key: str) -> StoredResponse | None:
+        return self._to_response(self._select(key))
+
+    def acquire(self, key: str) -> bool:
+        self._select(key)
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO idempotency (key, expires_at) VALUES (?, ?)",
+                (key, time.time() + self.pending_ttl),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, key: str, response: StoredResponse):
+        with self._connection() as connection:
+            connection.execute(
+                "REPLACE INTO idempotency "
+                "(key, expires_at, status, headers, body, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    time.time() + self.ttl,
+                    response.status,
+                    json.dumps(response.headers),
+                    response.body,
+                    response.fingerprint,
+                ),
+            )
+
+    def release(self, key: str):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM idempotency WHERE key = ?", (key,))
+
+    def wait(self, key: str, timeout: float) -> StoredResponse | None:
+        end = time.monotonic() + timeout
+        while True:
+            row = self._select(key)
+            if row is None or row[0] is not None or time.monotonic() >= end:
+                return self._to_response(row)
+            time.sleep(self.poll_interval)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from flask import current_app
+
+PENDING = "pending"
+COMPLETE = "complete"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = PENDING
+    result: Any = None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        data = {"id": self.id, "status": self.status}
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class JobQueue:
+    def submit(self, func: Callable, *args, **kwargs) -> Job:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Job | None:
+        raise NotImplementedError
+
+
+def _call_in_app_context(app, func: Callable, *args, **kwargs) -> Any:
+    with app.app_context():
+        return func(*args, **kwargs)
+
+
+class ExecutorJobQueue(JobQueue):
+    """
+    Run the jobs on an executor of the process, keeping the last `max_jobs` jobs.
+    With a thread pool, the jobs are run in the application context, with a
+    process pool the function and its arguments must be picklable.
+    """
+
+    def __init__(self, executor: Executor | None = None, max_jobs: int = 10000):
+        self.executor = executor or ThreadPoolExecutor()
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+
+    def get_error(self, job: Job, error: BaseException | None) -> str:
+        """The error returned to the clients, None if the job was cancelled"""
+        # Can be overridden
+        return "Job cancelled" if error is None else "Job failed"
+
+    def _done(self, job: Job, future: Future):
+        if future.cancelled():
+            job.error = self.get_error(job, None)
+            job.status = FAILED
+        elif (error := future.exception()) is not None:
+            logger.exception("Job %s failed", job.id, exc_info=error)
+            job.error = self.get_error(job, error)
+            job.status = FAILED
+        else:
+            job.result = future.result()
+            job.status = COMPLETE
+
+    def submit(self, func: Callable, *args, **kwargs) -> Job:
+        job = Job(id=uuid.uuid4().hex)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+        if isinstance(self.executor, ThreadPoolExecutor):
+            app = current_app._get_current_object()
+            future = self.executor.submit(
+                _call_in_app_context, app, func, *args, **kwargs
+            )
+        else:
+            future = self.executor.submit(func, *args, **kwargs)
+
+        future.add_done_callback(lambda future: self._done(job, future))
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from functools import partial
+from typing import Any, Callable, Dict, Tuple
+
+from flask import g, request, request_tearing_down
+from werkzeug.exceptions import TooManyRequests
+
+from .permissions import BasePermission
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on windows
+    fcntl = None
+
+_Update = Callable[[Any], Tuple[Any, Any]]
+
+
+class RateLimitExceeded(PermissionError):
+    """
+    Raised by the limit permissions. It is a PermissionError so that it composes
+    with Or/And, and the PermissionMixin converts it into a 429 response.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    def to_http_exception(self) -> TooManyRequests:
+        return TooManyRequests(
+            str(self), retry_after=max(1, math.ceil(self.retry_after))
+        )
+
+
+class LimitBackend:
+    def update(self, key: str, func: _Update, ttl: float | None = None) -> Any:
+        """
+        Atomically call func with the stored state for the key (None if unset).
+        The func returns (new_state, result), a new_state of None removes the key.
+        The state expires `ttl` seconds after its update, it is then unset.
+        """
+        raise NotImplementedError
+
+
+def _expires_at(now: float, ttl: float | None) -> float | None:
+    return None if ttl is None else now + ttl
+
+
+def _expired(expires_at: float | None, now: float) -> bool:
+    return expires_at is not None and expires_at <= now
+
+
+class InProcessBackend(LimitBackend):
+    """Limits shared by the threads of a single process"""
+
+    # Seconds between the removals of the expired states
+    sweep_interval = 60.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Key to its (state, expires_at)
+        self._states: Dict[str, Tuple[Any, float | None]] = {}
+        self._swept_at = 0.0
+
+    def _sweep(self, now: float):
+        self._states = {
+            key: entry
+            for key, entry in self._states.items()
+            if not _expired(entry[1], now)
+        }
+        self._swept_at = now
+
+    def update(self, key: str, func: _Update, ttl: float | None = None) -> Any:
+        now = time.time()
+        with self._lock:
+            if now - self._swept_at >= self.sweep_interval:
+                self._sweep(now)
+
+            stored, expires_at = self._states.get(key, (None, None))
+            state, result = func(None if _expired(expires_at, now) else stored)
+            if state is None:
+                self._states.pop(key, None)
+            else:
+                self._states[key] = (state, _expires_at(now, ttl))
+            return result
+
+
+class FileLockBackend(LimitBackend):
+    """
+    Limits shared by every process on the host, the states are stored as json in
+    the given file, and each update holds an exclusive lock on it. The expired
+    states are removed from the file when it is written.
+    """
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise RuntimeError("FileLockBackend requires fcntl")
+
+        self.path = path
+        self._lock = threading.Lock()
+
+    def update(self, key: str, func: _Update, ttl: float | None = None) -> Any:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._lock, os.fdopen(fd, "r+") as fp:
+            fcntl.flock(fp, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                content = fp.read()
+                # Key to its [state, expires_at]
+                states = {
+                    key_: entry
+                    for key_, entry in (json.loads(content) if content else {}).items()
+                    if not _expired(entry[1], now)
+                }
+                state, result = func(states.get(key, (None, None))[0])
+                if state is None:
+                    states.pop(key, None)
+                else:
+                    states[key] = [state, _expires_at(now, ttl)]
+                fp.seek(0)
+                fp.truncate()
+                json.dump(states, fp)
+                fp.flush()
+            finally:
+                fcntl.flock(fp, fcntl.LOCK_UN)
+            return result
+
+
+default_backend = InProcessBackend()
+
+
+class _LimitPermission(BasePermission):
+    backend: LimitBackend | None = None
+    error_message = "Too many requests"
+
+    def get_backend(self) -> LimitBackend:
+        # Can be overridden
+        return self.backend or default_backend
+
+    def get_key(self) -> str:
+        # Can be overridden, to limit per user for example
+        return f"{request.endpoint}:{request.remote_addr}"
+
+    def _get_backend_key(self) -> str:
+        return f"{type(self).__module__}.{type(self).__qualname__}:{self.get_key()}"
+
+
+class RateLimit(_LimitPermission):
+    """
+    Token bucket limit of `limit` requests per `period` seconds, allowing bursts
+    of up to `burst` requests (defaults to `limit`).
+    """
+
+    limit: int = 0
+    period: float = 1.0
+    burst: int | None = None
+
+    def __init__(self):
+        if self.limit <= 0 or self.period <= 0:
+            raise ValueError(f"{type(self).__name__} needs a positive limit and period")
+
+    def _get_ttl(self) -> float:
+        # Time for an empty bucket to refill, after which its state is a full one
+        return (self.burst or self.limit) * self.period / self.limit
+
+    def _consume(self, state: Any, now: float) -> Tuple[Any, float]:
+        capacity = self.burst or self.limit
+        rate = self.limit / self.period
+        tokens, updated_at = state if state is not None else (capacity, now)
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+        if tokens < 1:
+            return [tokens, now], (1 - tokens) / rate
+
+        return [tokens - 1, now], 0.0
+
+    def check_permission(self):
+        now = time.time()
+        retry_after = self.get_backend().update(
+            self._get_backend_key(),
+            lambda state: self._consume(state, now),
+            self._get_ttl(),
+        )
+        if retry_after:
+            raise RateLimitExceeded(self.error_message, retry_after)
+
+
+class SlidingWindowRateLimit(RateLimit):
+    """
+    Limit of `limit` requests in any `period` seconds, approximated by weighting
+    the count of the previous fixed window.
+    """
+
+    def _get_ttl(self) -> float:
+        # After two windows, the counts of the state are both 0
+        return 2 * self.period
+
+    def _consume(self, state: Any, now: float) -> Tuple[Any, float]:
+        window = int(now // self.period)
+        elapsed = (now % self.period) / self.period
+        start, previous, current = state if state is not None else (window, 0, 0)
+
+        if window == start + 1:
+            previous, current = current, 0
+        elif window != start:
+            previous, current = 0, 0
+
+        if previous * (1 - elapsed) + current >= self.limit:
+            return [window, previous, current], (1 - elapsed) * self.period
+
+        return [window, previous, current + 1], 0.0
+
+
+class ConcurrencyLimit(_LimitPermission):
+    """
+    Limit of `limit` requests being processed at once, the slot is released on
+    the teardown of the request, even if it failed. The slots are leases, a slot
+    of a worker that died during the request is reclaimed after `lease` seconds.
+    """
+
+    limit: int = 0
+    retry_after: float = 1.0
+    # Longer than the slowest request, as a slot is reclaimed once it expires
+    lease: float = 300.0
+
+    def __init__(self):
+        if self.limit <= 0:
+            raise ValueError(f"{type(self).__name__} needs a positive limit")
+
+    @staticmethod
+    def _acquire(
+        state: Any, limit: int, slot: str, now: float, lease: float
+    ) -> Tuple[Any, bool]:
+        # The state is a list of [slot, expires_at]
+        slots = [entry for entry in state or [] if entry[1] > now]
+        if len(slots) >= limit:
+            return slots or None, False
+        return slots + [[slot, now + lease]], True
+
+    @staticmethod
+    def _release(state: Any, slot: str) -> Tuple[Any, None]:
+        slots = [entry for entry in state or [] if entry[0] != slot]
+        return slots or None, None
+
+    def check_permission(self):
+        backend = self.get_backend()
+        key = self._get_backend_key()
+        slot = uuid.uuid4().hex
+
+        if not backend.update(
+            key,
+            lambda state: self._acquire(
+                state, self.limit, slot, time.time(), self.lease
+            ),
+            self.lease,
+        ):
+            raise RateLimitExceeded(self.error_message, self.retry_after)
+
+        g.setdefault("_flask_mixins_limit_slots", []).append(
+            (backend, key, partial(self._release, slot=slot), self.lease)
+        )
+
+
+def _release_slots(sender: Any, exc: BaseException | None = None, **extra):
+    for backend, key, release, ttl in g.pop("_flask_mixins_limit_slots", ()):
+        backend.update(key, release, ttl)
+
+
+request_tearing_down.connect(_release_slots)
@@ -0,0 +1,199 @@
+"""
+Memory allocated by the layers of the dispatch of a view.
+
+The mixins wrap their layers (permission, load, handler, dump, encode) in
+`track_layer`, which does nothing unless the request is tracked. For a tracked
+request, tracemalloc measures the peak of each layer (the most memory allocated
+at once during the layer) and its net allocation (the memory still allocated at
+its end, like the handler result or the dump output).
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, ContextManager, Dict, List
+
+from flask import g, request
+
+from .middleware import BaseMiddleware, is_triggered
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+PERMISSION = "permission"
+LOAD = "load"
+HANDLER = "handler"
+DUMP = "dump"
+ENCODE = "encode"
+
+# Before python 3.9, the peaks are the peak since the start of the request
+_reset_peak = getattr(tracemalloc, "reset_peak", lambda: None)
+
+
+@dataclass
+class LayerStats:
+    count: int = 0
+    peak_max: int = 0
+    peak_total: int = 0
+    net_total: int = 0
+
+    def add(self, peak: int, net: int):
+        self.count += 1
+        self.peak_max = max(self.peak_max, peak)
+        self.peak_total += peak
+        self.net_total += net
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "peak_max": self.peak_max,
+            "peak_mean": self.peak_total // self.count if self.count else 0,
+            "net_mean": self.net_total // self.count if self.count else 0,
+        }
+
+
+class _Tracker:
+    def __init__(self):
+        # Layer to its (peak, net) bytes in the request
+        self.layers: Dict[str, List[int]] = {}
+        # The start and the peak so far of the layers being measured
+        self._stack: List[List[int]] = []
+
+    @contextmanager
+    def layer(self, name: str):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # The peak of the outer layer is reset with the inner one
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        _reset_peak()
+        entry = [current, current]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            after, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, entry[1])
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+
+            # A layer run more than once (several loads) keeps its highest peak
+            measure = self.layers.setdefault(name, [0, 0])
+            measure[0] = max(measure[0], peak - entry[0])
+            measure[1] += after - entry[0]
+
+
+_tracker: ContextVar[_Tracker | None] = ContextVar(
+    "flask_mixins_memory_tracker", default=None
+)
+_NOT_TRACKED = nullcontext()
+
+
+def track_layer(name: str) -> ContextManager:
+    """Measure the memory allocated by a layer, if the request is tracked"""
+    tracker = _tracker.get()
+    return _NOT_TRACKED if tracker is None else tracker.layer(name)
+
+
+class MemoryTrackingMiddleware(BaseMiddleware):
+    """
+    Track the memory allocated by each layer of the views, for a fraction of the
+    requests (and those sent with the trigger header set to the trigger token, if
+    one is configured), aggregated per view class.
+    The tracked requests allocating more than the threshold at their peak are
+    logged. As tracemalloc traces the whole process, a single request is tracked
+    at a time, and the allocations of other threads are included.
+    """
+
+    trigger_header = "X-Memory-Track"
+
+    def __init__(
+        self,
+        app: Flask | None = None,
+        sample_rate: float = 0.0,
+        threshold: int | None = None,
+        trigger_token: str | None = None,
+    ):
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        # The secret to send in the trigger header, None disables the header
+        self.trigger_token = trigger_token
+        self.stats: Dict[str, Dict[str, LayerStats]] = {}
+        self._lock = threading.Lock()
+        self._tracking = threading.Lock()
+        super().__init__(app)
+
+    def init_app(self, app: Flask):
+        super().init_app(app)
+        app.teardown_request(self.teardown_request)
+
+    def should_track(self) -> bool:
+        # Can be overridden
+        if is_triggered(self.trigger_header, self.trigger_token):
+            return True
+        return random.random() < self.sample_rate
+
+    def get_threshold(self, view_name: str) -> int | None:
+        # Can be overridden, for a budget per view
+        return self.threshold
+
+    def before_request(self):
+        if not self.should_track() or not self._tracking.acquire(blocking=False):
+            return
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracker = _Tracker()
+        g._flask_mixins_memory = (tracker, _tracker.set(tracker), started)
+
+    def teardown_request(self, exc=None):
+        tracked = g.pop("_flask_mixins_memory", None)
+        if tracked is None:
+            return
+
+        tracker, token, started = tracked
+        _tracker.reset(token)
+        if started:
+            tracemalloc.stop()
+        self._tracking.release()
+
+        name = self.get_view_name()
+        with self._lock:
+            stats = self.stats.setdefault(name, {})
+            for layer, (peak, net) in tracker.layers.items():
+                stats.setdefault(layer, LayerStats()).add(peak, net)
+
+        peak = max((peak for peak, _ in tracker.layers.values()), default=0)
+        threshold = self.get_threshold(name)
+        if threshold is not None and peak > threshold:
+            logger.warning(
+                "%s %s (%s) allocated %s bytes at its peak: %s",
+                request.method,
+                request.path,
+                name,
+                peak,
+                ", ".join(
+                    f"{layer} peak={peak} net={net}"
+                    for layer, (peak, net) in tracker.layers.items()
+                ),
+            )
+
+    def report(self) -> Dict[str, Dict[str, dict]]:
+        with self._lock:
+            return {
+                name: {layer: stats.to_dict() for layer, stats in layers.items()}
+                for name, layers in self.stats.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
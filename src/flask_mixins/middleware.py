@@ -1,10 +1,32 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import hmac
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple, Union
+
+from flask import current_app, request
+from werkzeug import Response
+from werkzeug.exceptions import ServiceUnavailable
+
+from .deadline import parse_queue_start
 
 if TYPE_CHECKING:
     from flask import Flask
 
+# A response as the status code, headers and body, or a werkzeug response
+FastResponse = Union[Tuple[int, List[Tuple[str, str]], bytes], Response]
+
+
+def is_triggered(header: str, token: str | None) -> bool:
+    """
+    Whether the request is sent with the header set to the token, the header
+    triggering nothing without a token
+    """
+    if token is None or not (value := request.headers.get(header)):
+        return False
+    return hmac.compare_digest(value.encode(), token.encode())
+
 
 class BaseMiddleware:
     def __init__(self, app: Flask | None = None):
@@ -22,3 +44,106 @@ class BaseMiddleware:
 
     def after_request(self, response):
         return response
+
+    def get_view_name(self) -> str:
+        """The view class (or function) of the request"""
+        view_func = current_app.view_functions.get(request.endpoint)
+        view = getattr(view_func, "view_class", view_func)
+        if view is None:
+            return str(request.endpoint)
+        return f"{view.__module__}.{view.__qualname__}"
+
+
+class LoadSheddingMiddleware(BaseMiddleware):
+    """
+    Reject requests with a 503 when they have been queued for longer than
+    `max_queue_time` seconds before reaching a worker, or when the client timeout
+    has already elapsed while queued. The queue start is read from the header set
+    by the proxy (`t=<seconds since epoch>` or a bare timestamp in s, ms or us).
+    """
+
+    queue_start_header = "X-Request-Start"
+    timeout_header = "X-Request-Timeout"
+    retry_after = 1
+
+    def __init__(self, app: Flask | None = None, max_queue_time: float | None = None):
+        self.max_queue_time = max_queue_time
+        super().__init__(app)
+
+    @staticmethod
+    def parse_queue_start(value: str) -> float | None:
+        return parse_queue_start(value)
+
+    def get_queue_time(self) -> float | None:
+        header = request.headers.get(self.queue_start_header)
+        if not header or (start := self.parse_queue_start(header)) is None:
+            return None
+        return max(0.0, time.time() - start)
+
+    def should_shed(self, queue_time: float) -> bool:
+        # Can be overridden
+        if self.max_queue_time is not None and queue_time > self.max_queue_time:
+            return True
+
+        try:
+            timeout = float(request.headers.get(self.timeout_header, ""))
+        except ValueError:
+            return False
+        return queue_time >= timeout
+
+    def before_request(self):
+        queue_time = self.get_queue_time()
+        if queue_time is not None and self.should_shed(queue_time):
+            raise ServiceUnavailable(retry_after=self.retry_after)
+
+
+class FastPathMiddleware(BaseMiddleware):
+    """
+    Answer some requests from the raw WSGI environ, before Flask creates the
+    request context, matches the url and runs the hooks. The other requests go
+    through the Flask app, and the before/after request hooks, as usual.
+    """
+
+    # Path to (status, headers, body) answered as is to the GET and HEAD requests,
+    # like a health check
+    static_responses: Dict[str, Tuple[int, List[Tuple[str, str]], bytes]] = {}
+
+    def init_app(self, app: Flask):
+        super().init_app(app)
+        self.wsgi_app = app.wsgi_app
+        app.wsgi_app = self
+        self._static = {
+            path: self._prepare(response)
+            for path, response in self.static_responses.items()
+        }
+
+    @staticmethod
+    def _prepare(response: Tuple[int, List[Tuple[str, str]], bytes]) -> tuple:
+        status, headers, body = response
+        headers = [("Content-Length", str(len(body))), *headers]
+        return f"{status} {HTTPStatus(status).phrase}", headers, [body]
+
+    def before_routing(self, environ: Dict[str, Any]) -> FastResponse | None:
+        """Can be overridden to return a response directly"""
+        return None
+
+    def __call__(self, environ: Dict[str, Any], start_response) -> Iterable[bytes]:
+        method = environ.get("REQUEST_METHOD")
+        if method in ("GET", "HEAD") and (
+            static := self._static.get(environ.get("PATH_INFO", ""))
+        ):
+            status, headers, body = static
+            start_response(status, headers)
+            # The Content-Length of the body is kept for HEAD
+            return [] if method == "HEAD" else body
+
+        response = self.before_routing(environ)
+        if response is None:
+            return self.wsgi_app(environ, start_response)
+
+        if isinstance(response, tuple):
+            status, headers, body = self._prepare(response)
+            start_response(status, headers)
+            return [] if method == "HEAD" else body
+
+        return response(environ, start_response)
@@ -1,5 +1,16 @@
 from __future__ import annotations
 
+import json
+from functools import partial, reduce
+from operator import and_, or_
+from typing import Any, Callable, Dict, Iterable, List
+
+from werkzeug.exceptions import Forbidden
+
+# An object filter is either True (every object is allowed), False (no object is
+# allowed), or a query expression/predicate restricting the objects
+ObjectFilter = Any
+
 
 class PermissionType(type):
     def __or__(self, other: BasePermission | type[BasePermission]) -> BasePermission:
@@ -9,10 +20,183 @@ class PermissionType(type):
         return And(self, other)
 
 
+def set_denying_permission(error: PermissionError, permission: Any):
+    """Attach the innermost permission that denied the request to the error"""
+    if getattr(error, "permission", None) is None:
+        error.permission = permission
+
+
+def permission_name(permission: Any) -> str:
+    """Readable name of a permission, or of a tree of Or/And permissions"""
+    if isinstance(permission, (Or, And)):
+        operator = " | " if isinstance(permission, Or) else " & "
+        return f"({operator.join(map(permission_name, permission.permissions))})"
+    if isinstance(permission, type):
+        return permission.__name__
+    return type(permission).__name__
+
+
+class Decision:
+    """
+    The outcome of a permission, returned instead of raising. A denial has the
+    reason, the leaf permission that denied, and for an Or the denials of each
+    of its branches.
+    """
+
+    __slots__ = ("allowed", "reason", "permission", "error", "denials")
+
+    def __init__(
+        self,
+        allowed: bool,
+        reason: str | None = None,
+        permission: Any = None,
+        error: PermissionError | None = None,
+        denials: List[Decision] | None = None,
+    ):
+        self.allowed = allowed
+        self.reason = reason
+        self.permission = permission
+        # The error raised by a permission without the decision API
+        self.error = error
+        self.denials = denials
+
+    @classmethod
+    def allow(cls) -> Decision:
+        return ALLOW
+
+    @classmethod
+    def deny(
+        cls, reason: str | None, permission: Any, error: PermissionError | None = None
+    ) -> Decision:
+        return cls(False, reason, permission, error)
+
+    def __bool__(self) -> bool:
+        return self.allowed
+
+    def __repr__(self) -> str:
+        if self.allowed:
+            return "Decision(allowed)"
+        return f"Decision(denied, {self.reason!r}, {permission_name(self.permission)})"
+
+    def leaves(self) -> List[Decision]:
+        """The denials of the leaf permissions"""
+        if self.allowed:
+            return []
+        if not self.denials:
+            return [self]
+        return [leaf for denial in self.denials for leaf in denial.leaves()]
+
+    def report(self) -> List[Dict[str, Any]]:
+        return [
+            {"permission": permission_name(leaf.permission), "reason": leaf.reason}
+            for leaf in self.leaves()
+        ]
+
+    def raise_if_denied(self):
+        if self.allowed:
+            return
+        if self.error is not None:
+            raise self.error
+        error = PermissionError(self.reason)
+        error.permission = self.permission
+        raise error
+
+
+ALLOW = Decision(True)
+
+
+def decide(permission: Any) -> Decision:
+    """
+    Get the decision of an instantiated permission, calling `check_permission` for
+    the permissions without a `decide` method
+    """
+    if (decide_ := getattr(permission, "decide", None)) is not None:
+        return decide_()
+
+    try:
+        permission.check_permission()
+    except PermissionError as e:
+        set_denying_permission(e, permission)
+        return Decision.deny(str(e), e.permission, e)
+    return ALLOW
+
+
+class PermissionDenied(Forbidden):
+    """A 403 with the reasons of the denial"""
+
+    def __init__(self, decision: Decision):
+        super().__init__()
+        self.decision = decision
+
+    def get_body(self, *args, **kwargs) -> str:
+        return json.dumps(
+            {"message": "Permission denied", "reasons": self.decision.report()}
+        )
+
+    def get_headers(self, *args, **kwargs) -> list:
+        return [("Content-Type", "application/json")]
+
+
+def _passes(permission: Any) -> bool:
+    return decide(permission).allowed
+
+
+def get_object_filter(permission: Any, kind: str) -> ObjectFilter:
+    """
+    Get the "query_filter" or "object_predicate" of an instantiated permission,
+    permissions without them allow every object or none of them
+    """
+    if getter := getattr(permission, f"get_{kind}", None):
+        return getter()
+    return _passes(permission)
+
+
+def _combine_filters(
+    filters: Iterable[ObjectFilter],
+    combine: Callable[[list], ObjectFilter],
+    neutral: bool,
+) -> ObjectFilter:
+    restrictions = []
+    for filter_ in filters:
+        if filter_ is (not neutral):
+            return filter_
+        if filter_ is not neutral:
+            restrictions.append(filter_)
+
+    if not restrictions:
+        return neutral
+    if len(restrictions) == 1:
+        return restrictions[0]
+    return combine(restrictions)
+
+
+def _any(predicates: list) -> Callable[[Any], bool]:
+    return lambda obj: any(predicate(obj) for predicate in predicates)
+
+
+def _all(predicates: list) -> Callable[[Any], bool]:
+    return lambda obj: all(predicate(obj) for predicate in predicates)
+
+
+_COMBINE = {
+    "query_filter": (partial(reduce, or_), partial(reduce, and_)),
+    "object_predicate": (_any, _all),
+}
+
+
 class BasePermission(metaclass=PermissionType):
     def check_permission(self):
         raise NotImplementedError
 
+    def decide(self) -> Decision:
+        # Can be overridden to decide without raising
+        try:
+            self.check_permission()
+        except PermissionError as e:
+            set_denying_permission(e, self)
+            return Decision.deny(str(e), e.permission, e)
+        return ALLOW
+
     def __or__(self, other: BasePermission | type[BasePermission]) -> BasePermission:
         return Or(self, other)
 
@@ -35,31 +219,97 @@ class Permission(BasePermission):
         if not self.has_permission():
             raise PermissionError(self.error_message)
 
+    def decide(self) -> Decision:
+        if type(self).check_permission is not Permission.check_permission:
+            # The overridden check is the reference
+            return super().decide()
+        if self.has_permission():
+            return ALLOW
+        return Decision.deny(self.error_message, self)
+
+
+class ObjectPermission(BasePermission):
+    """
+    Permission on the individual objects of a list, expressed as a query filter
+    (applied to the query before it is executed) and as a predicate (applied to
+    lists when there is no query)
+    """
+
+    def check_permission(self):
+        # The objects are filtered instead
+        return
+
+    def decide(self) -> Decision:
+        return ALLOW
+
+    def query_filter(self) -> Any:
+        raise NotImplementedError
+
+    def has_object_permission(self, obj: Any) -> bool:
+        raise NotImplementedError
+
+    def get_query_filter(self) -> ObjectFilter:
+        return self.query_filter()
+
+    def get_object_predicate(self) -> ObjectFilter:
+        return self.has_object_permission
+
 
 class Or(BasePermission):
     def __init__(self, *args: tuple[BasePermission | type[BasePermission], ...]):
         self.permissions = args
 
-    def check_permission(self) -> bool:
-        errors = []
+    def _get_object_filter(self, kind: str) -> ObjectFilter:
+        return _combine_filters(
+            (get_object_filter(permission(), kind) for permission in self.permissions),
+            _COMBINE[kind][0],
+            False,
+        )
+
+    def get_query_filter(self) -> ObjectFilter:
+        return self._get_object_filter("query_filter")
+
+    def get_object_predicate(self) -> ObjectFilter:
+        return self._get_object_filter("object_predicate")
+
+    def decide(self) -> Decision:
+        denials = []
         for permission in self.permissions:
-            try:
-                return permission().check_permission()
-            except PermissionError as e:
-                errors.append(e)
-                continue
+            if (decision := decide(permission())).allowed:
+                return decision
+            denials.append(decision)
 
-        if errors:
-            raise errors[0] from None
+        if not denials:
+            return ALLOW
+        first = denials[0]
+        return Decision(False, first.reason, first.permission, first.error, denials)
+
+    def check_permission(self):
+        self.decide().raise_if_denied()
 
 
 class And(BasePermission):
     def __init__(self, *args: tuple[BasePermission | type[BasePermission], ...]):
         self.permissions = args
 
-    def check_permission(self):
+    def _get_object_filter(self, kind: str) -> ObjectFilter:
+        return _combine_filters(
+            (get_object_filter(permission(), kind) for permission in self.permissions),
+            _COMBINE[kind][1],
+            True,
+        )
+
+    def get_query_filter(self) -> ObjectFilter:
+        return self._get_object_filter("query_filter")
+
+    def get_object_predicate(self) -> ObjectFilter:
+        return self._get_object_filter("object_predicate")
+
+    def decide(self) -> Decision:
         for permission in self.permissions:
-            try:
-                permission().check_permission()
-            except PermissionError:
-                raise
+            if not (decision := decide(permission())).allowed:
+                return decision
+        return ALLOW
+
+    def check_permission(self):
+        self.decide().raise_if_denied()
@@ -0,0 +1,272 @@
+"""
+Structural pre-validation of request payloads.
+
+A schema is compiled once into a tree of checks of the json types, required
+fields, unknown fields and lengths, that rejects malformed payloads before the
+(much slower) marshmallow load, with the same error format. The checks are
+conservative: a payload they accept can still be rejected by the load, but a
+payload they reject would be rejected by the load too. Custom validators,
+pre/post load hooks and the conversion of the values remain the responsibility
+of marshmallow.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Optional
+
+from marshmallow import RAISE, Schema, ValidationError, fields, validate
+from marshmallow.decorators import PRE_LOAD
+
+# A check returns the errors of the value, or None
+Check = Callable[[Any], Optional[Any]]
+
+
+def _type_check(field: fields.Field, invalid: tuple, message: str) -> Check:
+    error = [field.error_messages[message]]
+    return lambda value: error if isinstance(value, invalid) else None
+
+
+def _length_check(field: fields.Field, inner: Check | None) -> Check | None:
+    lengths = [
+        validator
+        for validator in field.validators
+        if isinstance(validator, validate.Length)
+    ]
+    if not lengths:
+        return inner
+
+    def check(value):
+        if inner and (errors := inner(value)) is not None:
+            return errors
+        for length in lengths:
+            try:
+                length(value)
+            except ValidationError as e:
+                return e.messages
+        return None
+
+    return check
+
+
+def _list_check(field: fields.List, partial: Any) -> Check:
+    invalid = [field.error_messages["invalid"]]
+    item_check = _field_check(field.inner, partial)
+
+    def check(value):
+        if not isinstance(value, (list, tuple)):
+            if isinstance(value, (dict, str, bytes, int, float)):
+                return invalid
+            return None
+
+        if item_check is None:
+            return None
+
+        errors = {}
+        for index, item in enumerate(value):
+            if (error := _check_value(field.inner, item_check, item)) is not None:
+                errors[index] = error
+        return errors or None
+
+    return check
+
+
+def _nested_check(field: fields.Nested, partial: Any) -> Check:
+    # Compiled on the first nested value, as the schema can nest itself
+    compiled: list = []
+
+    def schema_check(value):
+        if not compiled:
+            compiled.append(_compile(field.schema, partial, field.unknown))
+        return compiled[0](value)
+
+    many_invalid = [field.error_messages["type"]]
+
+    if not field.many:
+        return schema_check
+
+    def check(value):
+        if not isinstance(value, (list, tuple)):
+            return many_invalid
+        # The nested schema has many=True
+        return schema_check(value)
+
+    return check
+
+
+# The json types rejected by the fields, with their "invalid" error
+_TYPE_CHECKS = (
+    (fields.Dict, (list, str, bytes, int, float)),
+    (fields.String, (int, float, bool, dict, list)),
+    (fields.Number, (bool, dict, list)),
+    (fields.Boolean, (dict, list)),
+)
+
+
+def _field_check(field: fields.Field, partial: Any) -> Check | None:
+    check: Check | None = None
+
+    if isinstance(field, fields.Pluck):
+        check = None
+    elif isinstance(field, fields.Nested):
+        check = _nested_check(field, partial)
+    elif isinstance(field, fields.List):
+        check = _list_check(field, partial)
+    else:
+        for base, invalid in _TYPE_CHECKS:
+            # The subclasses deserializing differently (UUID) have their own errors
+            if isinstance(field, base):
+                if type(field)._deserialize is base._deserialize:
+                    check = _type_check(field, invalid, "invalid")
+                break
+
+    return _length_check(field, check)
+
+
+def _check_value(field: fields.Field, check: Check | None, value: Any) -> Any:
+    if value is None:
+        if field.allow_none:
+            return None
+        return [field.error_messages["null"]]
+    return check(value) if check else None
+
+
+def _nested_partial(partial: Any, name: str) -> Any:
+    if partial is True or not partial:
+        return partial
+    prefix = f"{name}."
+    return tuple(key[len(prefix) :] for key in partial if key.startswith(prefix))
+
+
+def _no_check(data: Any) -> None:
+    return None
+
+
+def _compile(schema: Schema, partial: Any = None, unknown: str | None = None) -> Check:
+    if schema._hooks.get((PRE_LOAD, False)) or schema._hooks.get((PRE_LOAD, True)):
+        # The payload can be transformed before being loaded
+        return _no_check
+
+    if partial is None:
+        partial = schema.partial
+    if unknown is None:
+        unknown = schema.unknown
+
+    checks = []
+    for name, field in schema.load_fields.items():
+        required = field.required and not (
+            partial is True or (partial and name in partial)
+        )
+        checks.append(
+            (
+                field.data_key if field.data_key is not None else name,
+                field,
+                _field_check(field, _nested_partial(partial, name)),
+                [field.error_messages["required"]] if required else None,
+            )
+        )
+
+    known = {key for key, *_ in checks}
+    unknown_error = [schema.error_messages["unknown"]] if unknown == RAISE else None
+    type_error = {"_schema": [schema.error_messages["type"]]}
+    missing = object()
+
+    def check_item(data):
+        if not isinstance(data, Mapping):
+            return type_error
+
+        errors = {}
+        for key, field, check, required in checks:
+            value = data.get(key, missing)
+            if value is missing:
+                if required:
+                    errors[key] = required
+            elif (error := _check_value(field, check, value)) is not None:
+                errors[key] = error
+
+        if unknown_error and not known.issuperset(data):
+            for key in data:
+                if key not in known:
+                    errors[key] = unknown_error
+        return errors or None
+
+    if not schema.many:
+        return check_item
+
+    def check_many(data):
+        if not isinstance(data, (list, tuple)):
+            return type_error
+        errors = {}
+        for index, item in enumerate(data):
+            if (error := check_item(item)) is not None:
+                errors[index] = error
+        return errors or None
+
+    return check_many
+
+
+def _normalize_partial(partial: Any) -> Any:
+    if isinstance(partial, (list, tuple, set)):
+        return frozenset(partial)
+    return partial
+
+
+def _schema_key(
+    schema: Schema, partial: Any = None, unknown: str | None = None, path: tuple = ()
+) -> tuple:
+    """
+    The configuration of the schema and of its nested schemas (their only and
+    exclude being reflected by their load fields), a schema nesting itself being
+    only keyed once
+    """
+    if partial is None:
+        partial = schema.partial
+
+    key = (
+        type(schema),
+        frozenset(schema.load_fields),
+        _normalize_partial(partial),
+        unknown or schema.unknown,
+        schema.many,
+    )
+    if type(schema) in path:
+        return key
+
+    nested = []
+    for name, field in schema.load_fields.items():
+        while isinstance(field, fields.List):
+            field = field.inner
+        if isinstance(field, fields.Nested) and not isinstance(field, fields.Pluck):
+            nested.append(
+                (
+                    name,
+                    _schema_key(
+                        field.schema,
+                        _nested_partial(partial, name),
+                        field.unknown,
+                        path + (type(schema),),
+                    ),
+                )
+            )
+    return key + (tuple(nested),)
+
+
+_lock = threading.Lock()
+_cache: Dict[tuple, Check] = {}
+
+
+def compile_schema(schema: Schema) -> Check:
+    """Get the compiled check of the schema, cached per schema configuration"""
+    key = _schema_key(schema)
+    if (check := _cache.get(key)) is None:
+        check = _compile(schema)
+        with _lock:
+            _cache[key] = check
+    return check
+
+
+def prevalidate(schema: Schema, data: Any):
+    """Raise a ValidationError if the data is structurally invalid for the schema"""
+    if (errors := compile_schema(schema)(data)) is not None:
+        raise ValidationError(errors)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Dict
+
+from flask import g
+
+from .middleware import BaseMiddleware, is_triggered
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+    from flask import Flask
+
+
+def _collapse(frame: FrameType | None) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+            f"{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+def _filename(name: str) -> str:
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+class _Sampler:
+    """Background thread sampling the stacks of the threads being profiled"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._threads: Dict[int, Counter] = {}
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, thread_id: int):
+        with self._lock:
+            self._threads[thread_id] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="flask-mixins-sampler", daemon=True
+                )
+                self._thread.start()
+            self._wakeup.set()
+
+    def stop(self, thread_id: int) -> Counter:
+        with self._lock:
+            return self._threads.pop(thread_id, Counter())
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            frames = sys._current_frames()
+            with self._lock:
+                if not self._threads:
+                    self._wakeup.clear()
+                    continue
+                for thread_id, stacks in self._threads.items():
+                    if frame := frames.get(thread_id):
+                        stacks[_collapse(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+class ProfilingMiddleware(BaseMiddleware):
+    """
+    Profile a fraction of the requests (and those sent with the trigger header set
+    to the trigger token, if one is configured), aggregating the profiles per view
+    class. The "cprofile" mode collects deterministic pstats, the "sampling" mode
+    collects collapsed stacks that can be loaded by flamegraph tools.
+    """
+
+    trigger_header = "X-Profile"
+
+    def __init__(
+        self,
+        app: Flask | None = None,
+        sample_rate: float = 0.0,
+        mode: str = "cprofile",
+        interval: float = 0.005,
+        trigger_token: str | None = None,
+    ):
+        if mode not in ("cprofile", "sampling"):
+            raise ValueError(f"Unknown profiling mode {mode}")
+
+        self.sample_rate = sample_rate
+        self.mode = mode
+        # The secret to send in the trigger header, None disables the header
+        self.trigger_token = trigger_token
+        self.stats: Dict[str, pstats.Stats] = {}
+        self.stacks: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+        self._sampler = _Sampler(interval)
+        super().__init__(app)
+
+    def init_app(self, app: Flask):
+        super().init_app(app)
+        app.teardown_request(self.teardown_request)
+
+    def should_profile(self) -> bool:
+        # Can be overridden
+        if is_triggered(self.trigger_header, self.trigger_token):
+            return True
+        return random.random() < self.sample_rate
+
+    def before_request(self):
+        if not self.should_profile():
+            return
+
+        if self.mode == "sampling":
+            g._flask_mixins_profiler = threading.get_ident()
+            self._sampler.start(g._flask_mixins_profiler)
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in the process
+            return
+        g._flask_mixins_profiler = profiler
+
+    def teardown_request(self, exc=None):
+        profiler = g.pop("_flask_mixins_profiler", None)
+        if profiler is None:
+            return
+
+        name = self.get_view_name()
+        if self.mode == "sampling":
+            stacks = self._sampler.stop(profiler)
+            with self._lock:
+                self.stacks.setdefault(name, Counter()).update(stacks)
+            return
+
+        profiler.disable()
+        with self._lock:
+            if name in self.stats:
+                self.stats[name].add(profiler)
+            else:
+                self.stats[name] = pstats.Stats(profiler)
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.stacks.clear()
+
+    def dump(self, directory: str) -> list[str]:
+        """Write a `<view>.pstats` or `<view>.collapsed` file per view class"""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+
+        with self._lock:
+            for name, stats in self.stats.items():
+                paths.append(os.path.join(directory, f"{_filename(name)}.pstats"))
+                stats.dump_stats(paths[-1])
+
+            for name, stacks in self.stacks.items():
+                paths.append(os.path.join(directory, f"{_filename(name)}.collapsed"))
+                with open(paths[-1], "w") as fp:
+                    for stack, count in stacks.most_common():
+                        fp.write(f"{stack} {count}\n")
+
+        return paths
@@ -0,0 +1,106 @@
+"""
+Passthrough of pre-encoded json.
+
+A `RawJSON` value (a cached blob, a json column, the body of an upstream
+response) is spliced as is in the encoded response, wherever it is in the
+structure, instead of being decoded to be encoded again. The encoder of the app
+replaces each value with a unique placeholder string, which is then substituted
+with the raw json in the output.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import uuid
+from typing import Any, List
+
+from flask import current_app
+from marshmallow import fields
+from werkzeug import Response
+
+_MARKER = f"__flask_mixins_raw_json_{uuid.uuid4().hex}_"
+_PLACEHOLDER = re.compile(f'"{_MARKER}(\\d+)"')
+
+
+class RawJSON:
+    """Valid json, inserted as is in the response"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: str | bytes):
+        self.data = data.decode() if isinstance(data, bytes) else data
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, RawJSON) and other.data == self.data
+
+    def __repr__(self) -> str:
+        return f"RawJSON({self.data!r})"
+
+
+def dumps(obj: Any, **kwargs) -> str:
+    """Encode with the json provider of the app, splicing the RawJSON values"""
+    provider = current_app.json
+    fallback = getattr(provider, "default", None)
+    fragments: List[str] = []
+
+    def default(value: Any) -> Any:
+        if isinstance(value, RawJSON):
+            fragments.append(value.data)
+            return f"{_MARKER}{len(fragments) - 1}"
+        if fallback is None:
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON")
+        return fallback(value)
+
+    text = provider.dumps(obj, default=default, **kwargs)
+    if not fragments:
+        return text
+    return _PLACEHOLDER.sub(lambda match: fragments[int(match.group(1))], text)
+
+
+def jsonify(obj: Any) -> Response:
+    """`flask.jsonify` of a single object, splicing the RawJSON values"""
+    provider = current_app.json
+    if not is_raw(obj):
+        try:
+            return provider.response(obj)
+        except TypeError:
+            # A RawJSON nested in the object, which the provider can't encode
+            pass
+
+    compact = getattr(provider, "compact", None)
+    if (compact is None and current_app.debug) or compact is False:
+        dump_args = {"indent": 2}
+    else:
+        dump_args = {"separators": (",", ":")}
+    return current_app.response_class(
+        f"{dumps(obj, **dump_args)}\n", mimetype=provider.mimetype
+    )
+
+
+def is_raw(obj: Any) -> bool:
+    """A RawJSON, or a non empty list of RawJSON"""
+    if isinstance(obj, RawJSON):
+        return True
+    return (
+        isinstance(obj, list)
+        and bool(obj)
+        and isinstance(obj[0], RawJSON)
+        and all(isinstance(item, RawJSON) for item in obj)
+    )
+
+
+class RawJSONField(fields.Field):
+    """
+    Field of a json string dumped as is, and loaded from any json value into its
+    encoded string. The decoded values (of a JSON column for example) are dumped
+    like a Raw field.
+    """
+
+    def _serialize(self, value: Any, attr: str, obj: Any, **kwargs) -> Any:
+        if isinstance(value, (str, bytes)):
+            return RawJSON(value)
+        return value
+
+    def _deserialize(self, value: Any, attr: str, data: Any, **kwargs) -> str:
+        return json.dumps(value)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Dict, Tuple
+
+from .idempotency import StoredResponse
+
+if TYPE_CHECKING:
+    from werkzeug import Response
+
+
+class Flight:
+    """A request in flight, and the response shared with its duplicates"""
+
+    __slots__ = ("done", "response", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: StoredResponse | None = None
+        self.waiters = 0
+
+    def wait(self, timeout: float) -> StoredResponse | None:
+        self.done.wait(timeout)
+        return self.response
+
+
+class SingleFlight:
+    """Coordinate the identical requests in flight in the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, Flight] = {}
+
+    def join(self, key: str) -> Tuple[Flight, bool]:
+        """Get the flight of the key, and whether the caller leads it"""
+        with self._lock:
+            if (flight := self._flights.get(key)) is not None:
+                flight.waiters += 1
+                return flight, False
+            flight = self._flights[key] = Flight()
+            return flight, True
+
+    def land(self, key: str, flight: Flight, response: Response | None):
+        """
+        Share the response of the leader with the waiting requests, None making
+        them run independently. The response is only copied if there are any.
+        """
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            # No request can join the flight anymore
+            waiters = flight.waiters
+        if waiters and response is not None:
+            flight.response = StoredResponse.from_response(response)
+        flight.done.set()
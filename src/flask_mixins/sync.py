@@ -0,0 +1,70 @@
+"""
+Incremental sync of collections.
+
+A client polling a collection sends the token of its last sync in the `since`
+query parameter, and the handler returns the items changed and the ids of the
+items deleted since then, with the token of the new state. Only the changes are
+dumped, the response being an envelope with the items, the deleted ids and the
+next token. The tokens are opaque to the clients, they encode a cursor of the
+handler (a version number, a timestamp...).
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from typing import Any, List
+
+from marshmallow import fields
+from werkzeug.exceptions import Gone
+
+
+def encode_sync_token(cursor: Any) -> str:
+    data = json.dumps(cursor, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> Any:
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        return json.loads(data)
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid sync token") from None
+
+
+class SyncToken(fields.Field):
+    """Field of a filter schema, loading a sync token into its cursor"""
+
+    default_error_messages = {"invalid": "Invalid sync token."}
+
+    def _serialize(self, value: Any, attr: str, obj: Any, **kwargs) -> str | None:
+        return None if value is None else encode_sync_token(value)
+
+    def _deserialize(self, value: Any, attr: str, data: Any, **kwargs) -> Any:
+        if not isinstance(value, str):
+            raise self.make_error("invalid")
+        try:
+            return decode_sync_token(value)
+        except ValueError:
+            raise self.make_error("invalid") from None
+
+
+class SyncTokenExpired(Gone):
+    """The changes since the token are no longer known, a full sync is needed"""
+
+    description = "The sync token has expired, sync without a token."
+
+
+@dataclass
+class SyncResult:
+    # The objects changed since the token, dumped with the response schema
+    changed: Any
+    # The cursor of the state returned, the token of the next sync
+    cursor: Any
+    deleted: List[Any] = field(default_factory=list)
+
+    @property
+    def token(self) -> str:
+        return encode_sync_token(self.cursor)
@@ -0,0 +1,233 @@
+"""
+Direct invocation of the views, for fast tests and benchmarks.
+
+The test client of flask builds a complete environ, routes the request through
+the wsgi app and wraps the response for each call. The `ViewClient` builds the
+environ of the view once, and for each call pushes a request context without
+matching the url, then runs the request hooks, the view and the error handlers
+of the app as `Flask.wsgi_app` does. The wsgi middlewares wrapping
+`app.wsgi_app` (the `FastPathMiddleware` for example) are not called.
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping
+from urllib.parse import urlencode
+
+from flask import request, request_started
+from flask.ctx import RequestContext
+from flask.testing import EnvironBuilder
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.exceptions import MethodNotAllowed
+from werkzeug.routing import Rule
+
+if TYPE_CHECKING:
+    from flask import Flask, Response
+    from flask.views import View
+
+
+class _ViewRequestContext(RequestContext):
+    """Request context of a view called directly, the url is not matched"""
+
+    def match_request(self):
+        pass
+
+
+class ViewResult:
+    """The response of the view, after the mixins and the hooks of the app"""
+
+    __slots__ = ("response",)
+
+    def __init__(self, response: Response):
+        self.response = response
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def headers(self) -> Headers:
+        return self.response.headers
+
+    @property
+    def json(self) -> Any:
+        return self.response.get_json()
+
+    def __repr__(self) -> str:
+        return f"<ViewResult {self.response.status}>"
+
+
+class ViewClient:
+    """
+    Call a view of the app directly, with the method, json body, query args and
+    view args given, and return its response
+
+        client = ViewClient(app, ItemView, path="/items/<int:item_id>")
+        result = client.patch(json={"name": "new"}, view_args={"item_id": 1})
+
+    The view is either the endpoint of a registered view, or a view class, which
+    is dispatched with its registered view function and rule if it has one.
+    """
+
+    def __init__(self, app: Flask, view: type[View] | str, path: str | None = None):
+        self.app = app
+        endpoint, self.view_func = self._get_view_func(view)
+        self.rule = self._get_rule(endpoint, path)
+        self.methods = frozenset(self.rule.methods or ())
+
+        builder = EnvironBuilder(app, path=path or self.rule.rule)
+        try:
+            self._environ = builder.get_environ()
+        finally:
+            builder.close()
+
+    def _get_view_func(self, view: type[View] | str) -> tuple[str, Callable]:
+        if isinstance(view, str):
+            return view, self.app.view_functions[view]
+
+        for endpoint, view_func in self.app.view_functions.items():
+            if getattr(view_func, "view_class", None) is view:
+                return endpoint, view_func
+        return view.__name__, view.as_view(view.__name__)
+
+    def _get_rule(self, endpoint: str, path: str | None) -> Rule:
+        try:
+            return next(self.app.url_map.iter_rules(endpoint))
+        except KeyError:
+            pass
+
+        # The rule flask would add for the view
+        methods = set(getattr(self.view_func, "methods", None) or ("GET",))
+        automatic_options = getattr(self.view_func, "provide_automatic_options", None)
+        if automatic_options is None:
+            automatic_options = "OPTIONS" not in methods and self.app.config.get(
+                "PROVIDE_AUTOMATIC_OPTIONS", True
+            )
+        if automatic_options:
+            methods.add("OPTIONS")
+
+        rule = Rule(path or "/", endpoint=endpoint, methods=methods)
+        rule.provide_automatic_options = automatic_options
+        return rule
+
+    def _make_environ(
+        self,
+        method: str,
+        json: Any,
+        args: Mapping[str, Any] | None,
+        headers: Mapping[str, str] | None,
+    ) -> Dict[str, Any]:
+        environ = dict(self._environ)
+        environ["REQUEST_METHOD"] = method
+        if args:
+            environ["QUERY_STRING"] = urlencode(list(MultiDict(args).items(multi=True)))
+        if json is not None:
+            body = self.app.json.dumps(json).encode()
+            environ["wsgi.input"] = io.BytesIO(body)
+            environ["CONTENT_LENGTH"] = str(len(body))
+            environ["CONTENT_TYPE"] = "application/json"
+        else:
+            environ["wsgi.input"] = io.BytesIO()
+        for key, value in (headers or {}).items():
+            key = key.upper().replace("-", "_")
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = f"HTTP_{key}"
+            environ[key] = value
+        return environ
+
+    def _dispatch(self, view_args: Dict[str, Any]) -> Response:
+        app = self.app
+        try:
+            request_started.send(app, _async_wrapper=app.ensure_sync)
+            rv = app.preprocess_request()
+            if rv is None:
+                rv = self._call_view(view_args)
+        except Exception as e:
+            rv = app.handle_user_exception(e)
+        return app.finalize_request(rv)
+
+    def _call_view(self, view_args: Dict[str, Any]) -> Any:
+        # The responses of the routing
+        if request.routing_exception is not None:
+            raise request.routing_exception
+        if request.method == "OPTIONS" and getattr(
+            self.rule, "provide_automatic_options", False
+        ):
+            response = self.app.response_class()
+            response.allow.update(self.methods)
+            return response
+        return self.app.ensure_sync(self.view_func)(**view_args)
+
+    def open(
+        self,
+        method: str = "GET",
+        json: Any = None,
+        args: Mapping[str, Any] | None = None,
+        view_args: Dict[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+        path: str | None = None,
+    ) -> ViewResult:
+        """
+        The view args are passed as is to the view, they are not converted by the
+        converters of the rule, and the path of the request is the path of the
+        client, unless given.
+        """
+        method = method.upper()
+        view_args = view_args or {}
+        app = self.app
+        environ = self._make_environ(method, json, args, headers)
+        if path is not None:
+            environ["PATH_INFO"] = path
+        ctx = _ViewRequestContext(app, environ)
+        if method in self.methods:
+            ctx.request.url_rule = self.rule
+            ctx.request.view_args = view_args
+        else:
+            ctx.request.routing_exception = MethodNotAllowed(
+                valid_methods=list(self.methods)
+            )
+
+        error: BaseException | None = None
+        try:
+            try:
+                ctx.push()
+                response = self._dispatch(view_args)
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+            except:  # noqa: E722
+                error = sys.exc_info()[1]
+                raise
+            # The headers and the body as sent on the wsgi path
+            response.headers = response.get_wsgi_headers(environ)
+            status = response.status_code
+            if method == "HEAD" or status < 200 or status in (204, 304):
+                response.response = []
+            return ViewResult(response)
+        finally:
+            if error is not None and app.should_ignore_error(error):
+                error = None
+            ctx.pop(error)
+
+    def get(self, **kwargs) -> ViewResult:
+        return self.open("GET", **kwargs)
+
+    def head(self, **kwargs) -> ViewResult:
+        return self.open("HEAD", **kwargs)
+
+    def post(self, **kwargs) -> ViewResult:
+        return self.open("POST", **kwargs)
+
+    def put(self, **kwargs) -> ViewResult:
+        return self.open("PUT", **kwargs)
+
+    def patch(self, **kwargs) -> ViewResult:
+        return self.open("PATCH", **kwargs)
+
+    def delete(self, **kwargs) -> ViewResult:
+        return self.open("DELETE", **kwargs)
+
+    def options(self, **kwargs) -> ViewResult:
+        return self.open("OPTIONS", **kwargs)
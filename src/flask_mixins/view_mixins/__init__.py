@@ -1,12 +1,18 @@
+from .deadline_mixin import DeadlineMixin
+from .idempotency_mixin import IdempotencyMixin
 from .misc_mixins import JsonifyMixin, StatusCodeMixin
 from .permission_mixin import PermissionMixin
 from .schema_mixin import SchemaMixin
 from .service_mixin import ServiceMixin
+from .single_flight_mixin import SingleFlightMixin
 
 __all__ = [
+    "DeadlineMixin",
+    "IdempotencyMixin",
     "JsonifyMixin",
     "StatusCodeMixin",
     "PermissionMixin",
     "SchemaMixin",
     "ServiceMixin",
+    "SingleFlightMixin",
 ]
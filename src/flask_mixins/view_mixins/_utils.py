@@ -1,5 +1,111 @@
-from flask import request
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Dict
+
+from flask import current_app, g, request
+from werkzeug import Response
+
+if TYPE_CHECKING:
+    from flask import Request
+    from werkzeug.datastructures import EnvironHeaders, MultiDict
+
+_MISSING = object()
+
+
+def _get_state() -> Dict[str, Any]:
+    if (state := g.get("_flask_mixins_state")) is None:
+        state = g._flask_mixins_state = {}
+    return state
+
+
+class DispatchContext:
+    """
+    The request data used by the mixins, read once from `flask.request` when the
+    view is dispatched, as each access to the request goes through a proxy
+    """
+
+    __slots__ = (
+        "request",
+        "method",
+        "endpoint",
+        "args",
+        "view_args",
+        "headers",
+        "state",
+        "_json",
+    )
+
+    def __init__(self, request_: Request):
+        self.request = request_
+        self.method: str = request_.method.lower()
+        self.endpoint: str | None = request_.endpoint
+        self.args: MultiDict = request_.args
+        self.view_args: Dict[str, Any] | None = request_.view_args
+        self.headers: EnvironHeaders = request_.headers
+        self.state = _get_state()
+        self._json = _MISSING
+
+    def get_json(self) -> Any:
+        if self._json is _MISSING:
+            self._json = self.request.get_json(force=True)
+        return self._json
+
+
+_current: ContextVar[DispatchContext | None] = ContextVar(
+    "flask_mixins_dispatch_context", default=None
+)
+
+
+def dispatch_context() -> DispatchContext:
+    """
+    The context of the view being dispatched, or the one of the current request
+    when called outside of the dispatch of a `_BaseView` (by the mixins used on
+    their own), created once per request
+    """
+    if (context := _current.get()) is None:
+        request_ = request._get_current_object()
+        if (context := getattr(request_, "_flask_mixins_context", None)) is None:
+            context = request_._flask_mixins_context = DispatchContext(request_)
+    return context
+
+
+def run_with_dispatch_context(view_dispatch, *args, **kwargs) -> Any:
+    """Call the dispatch of the view with the context of the request set"""
+    token = _current.set(DispatchContext(request._get_current_object()))
+    try:
+        return view_dispatch(*args, **kwargs)
+    finally:
+        _current.reset(token)
 
 
 def method() -> str:
+    if (context := _current.get()) is not None:
+        return context.method
     return request.method.lower()
+
+
+def request_state() -> Dict[str, Any]:
+    """
+    State of the mixins for the current request, which must not be stored on the
+    view as the instances can be shared between requests
+    """
+    if (context := _current.get()) is not None:
+        return context.state
+    return _get_state()
+
+
+def skip_head_body(view: Any) -> bool:
+    """
+    The body of a HEAD response is discarded, so it is only serialized if the view
+    needs its Content-Length
+    """
+    return method() == "head" and not getattr(view, "head_content_length", False)
+
+
+def head_response() -> Response:
+    """Json response without a body, for a HEAD request"""
+    response = current_app.response_class(mimetype=current_app.json.mimetype)
+    # The length of the body is unknown, rather than 0
+    response.automatically_set_content_length = False
+    return response
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from ..deadline import Deadline, parse_queue_start
+from ._utils import dispatch_context, request_state
+
+if TYPE_CHECKING:
+    from flask.views import MethodView
+
+    _Base = MethodView
+else:
+    _Base = object
+
+
+class DeadlineMixin(_Base):
+    # Seconds the view has to respond, the header can only shorten it
+    timeout: float | None = None
+    deadline_header = "X-Request-Timeout"
+    # The deadline runs from the queue start set by the proxy, like the shedding
+    queue_start_header = "X-Request-Start"
+
+    @property
+    def deadline(self) -> Deadline | None:
+        return request_state().get("deadline")
+
+    def get_timeout(self) -> float | None:
+        # Can be overridden
+        timeouts = [self.timeout] if self.timeout is not None else []
+
+        if header := dispatch_context().headers.get(self.deadline_header):
+            try:
+                timeouts.append(float(header))
+            except ValueError:
+                pass
+
+        return min(timeouts) if timeouts else None
+
+    def get_start(self) -> float | None:
+        """The queue start of the request on the monotonic clock, if known"""
+        header = dispatch_context().headers.get(self.queue_start_header)
+        if not header or (start := parse_queue_start(header)) is None:
+            return None
+        return time.monotonic() - max(0.0, time.time() - start)
+
+    def get_deadline(self) -> Deadline | None:
+        # Can be overridden
+        timeout = self.get_timeout()
+        if timeout is None:
+            return None
+        return Deadline.from_timeout(timeout, start=self.get_start())
+
+    def dispatch_request(self, *args, **kwargs):
+        """
+        Set the deadline of the request, which is checked by the other mixins
+        between each phase, aborting with a 504 once it has expired
+        """
+        deadline = request_state()["deadline"] = self.get_deadline()
+
+        if deadline is not None:
+            deadline.check()
+
+        return super().dispatch_request(*args, **kwargs)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from flask import current_app
+from werkzeug.exceptions import Conflict, UnprocessableEntity
+
+from ..idempotency import StoredResponse
+from ._utils import dispatch_context
+
+if TYPE_CHECKING:
+    from flask.views import MethodView
+
+    from ..idempotency import IdempotencyStore
+
+    _Base = MethodView
+else:
+    _Base = object
+
+
+class IdempotencyMixin(_Base):
+    idempotency_store: IdempotencyStore | None = None
+    idempotency_header = "Idempotency-Key"
+    idempotency_methods = ("post", "put", "patch")
+    # Seconds to wait for a concurrent request with the same key
+    idempotency_timeout = 10.0
+
+    def get_idempotency_identity(self) -> str | None:
+        """
+        Can be overridden to scope the keys per user, as the stored responses are
+        replayed without checking the permissions, so that a response is only
+        replayed to the user who sent the request. None (the default) disables
+        the idempotency.
+        """
+        return None
+
+    def get_idempotency_key(self) -> str | None:
+        context = dispatch_context()
+        if context.method not in self.idempotency_methods:
+            return None
+        if not (key := context.headers.get(self.idempotency_header)):
+            return None
+        if (identity := self.get_idempotency_identity()) is None:
+            return None
+
+        scope = "\0".join(
+            (
+                identity,
+                str(context.endpoint),
+                context.method,
+                key,
+            )
+        )
+        return hashlib.sha256(scope.encode()).hexdigest()
+
+    def get_idempotency_fingerprint(self) -> str:
+        """Hash of the view args, query and body, which a retry must send again"""
+        context = dispatch_context()
+        fingerprint = hashlib.sha256(
+            repr(
+                (
+                    sorted((context.view_args or {}).items()),
+                    sorted(context.args.items(multi=True)),
+                )
+            ).encode()
+        )
+        fingerprint.update(b"\0")
+        fingerprint.update(context.request.get_data())
+        return fingerprint.hexdigest()
+
+    @staticmethod
+    def _replay(stored: StoredResponse, fingerprint: str):
+        if stored.fingerprint != fingerprint:
+            raise UnprocessableEntity(
+                "The idempotency key was used for a different request"
+            )
+        response = stored.to_response()
+        response.headers["Idempotent-Replayed"] = "true"
+        return response
+
+    def dispatch_request(self, *args, **kwargs):
+        """
+        Replay the stored response of a request with the same idempotency key, or
+        wait for it if it is still in flight. Server errors are not stored so
+        that they can be retried.
+        """
+        store = self.idempotency_store
+        if store is None or (key := self.get_idempotency_key()) is None:
+            return super().dispatch_request(*args, **kwargs)
+
+        fingerprint = self.get_idempotency_fingerprint()
+        if (stored := store.get(key)) is not None:
+            return self._replay(stored, fingerprint)
+
+        if not store.acquire(key):
+            if (stored := store.wait(key, self.idempotency_timeout)) is not None:
+                return self._replay(stored, fingerprint)
+            raise Conflict("A request with the same idempotency key is in progress")
+
+        try:
+            response = current_app.make_response(
+                super().dispatch_request(*args, **kwargs)
+            )
+        except BaseException:
+            store.release(key)
+            raise
+
+        if response.status_code >= 500:
+            store.release(key)
+        else:
+            store.complete(key, StoredResponse.from_response(response, fingerprint))
+        return response
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from flask import jsonify, make_response
+from flask import make_response
 
-from ._utils import method
+from ..memory import ENCODE, track_layer
+from ..raw_json import RawJSON, jsonify
+from ._utils import head_response, method, skip_head_body
 
 if TYPE_CHECKING:
     from flask.views import MethodView
@@ -15,9 +17,19 @@ else:
 
 
 class JsonifyMixin(_Base):
+    # Serialize the body of the HEAD responses, to send their Content-Length
+    head_content_length = False
+
+    def _jsonify(self, data: dict | list | RawJSON):
+        if skip_head_body(self):
+            return head_response()
+        with track_layer(ENCODE):
+            return jsonify(data)
+
     def dispatch_request(self, *args, **kwargs):
         """
-        Jsonify the dict or list of items in the response
+        Jsonify the dict or list of items in the response, the RawJSON values being
+        inserted as is
         """
         response = super().dispatch_request(*args, **kwargs)
 
@@ -30,11 +42,11 @@ class JsonifyMixin(_Base):
             if response[0] is None:
                 response = ({}, response[1])
 
-            if isinstance(response[0], dict) or isinstance(response[0], list):
-                return make_response(jsonify(response[0]), response[1])
+            if isinstance(response[0], (dict, list, RawJSON)):
+                return make_response(self._jsonify(response[0]), response[1])
 
-        if isinstance(response, dict) or isinstance(response, list):
-            return jsonify(response)
+        if isinstance(response, (dict, list, RawJSON)):
+            return self._jsonify(response)
 
         return response
 
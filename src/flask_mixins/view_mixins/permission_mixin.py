@@ -1,8 +1,23 @@
 from __future__ import annotations
 
+import time
 from typing import TYPE_CHECKING, Any, Iterable, Protocol
 
-from ._utils import method
+from werkzeug.exceptions import HTTPException
+
+from ..audit import DENIED, GRANTED, AuditLog, AuditRecord
+from ..deadline import check_deadline
+from ..limits import RateLimitExceeded
+from ..memory import HANDLER, PERMISSION, track_layer
+from ..permissions import (
+    And,
+    Decision,
+    PermissionDenied,
+    decide,
+    get_object_filter,
+    permission_name,
+)
+from ._utils import method, request_state
 
 if TYPE_CHECKING:
     from flask.views import MethodView
@@ -21,6 +36,10 @@ class PermissionProtocol(Protocol):
 
 
 class PermissionMixin(_Base):
+    audit_log: AuditLog | None = None
+    # Record the granted requests too, not only the denied ones
+    audit_grants = False
+
     def _get_permissions(self) -> Iterable[type[PermissionProtocol]]:
         return getattr(self, "permissions", [])
 
@@ -45,13 +64,93 @@ class PermissionMixin(_Base):
     def get_get_permissions(self) -> Iterable[type[PermissionProtocol]]:
         return self.get_read_permissions()
 
+    def get_head_permissions(self) -> Iterable[type[PermissionProtocol]]:
+        # A HEAD request is handled by the get method
+        return self.get_get_permissions()
+
     def get_permissions(self) -> Iterable[type[PermissionProtocol]]:
         if method_ := getattr(self, f"get_{method()}_permissions", None):
             return method_()
         return self._get_permissions()
 
-    def dispatch_request(self, *args, **kwargs) -> Any:
+    def get_object_permissions(self) -> Iterable[type[PermissionProtocol]]:
+        # Can be overridden
+        return getattr(self, "object_permissions", [])
+
+    def filter_permitted(self, objects: Any) -> Any:
+        """
+        Restrict the objects to those allowed by the object permissions. A query
+        (anything with a `filter` method, like a SQLAlchemy query) is filtered
+        before being executed, otherwise the list is filtered in a single pass.
+        """
+        permissions = And(*self.get_object_permissions())
+
+        if not isinstance(objects, (list, tuple)) and hasattr(objects, "filter"):
+            query_filter = get_object_filter(permissions, "query_filter")
+            return objects if query_filter is True else objects.filter(query_filter)
+
+        predicate = get_object_filter(permissions, "object_predicate")
+        if predicate is True:
+            return list(objects)
+        if predicate is False:
+            return []
+        return [obj for obj in objects if predicate(obj)]
+
+    def check_object_permissions(self, obj: Any):
+        predicate = get_object_filter(
+            And(*self.get_object_permissions()), "object_predicate"
+        )
+        if predicate is False or (predicate is not True and not predicate(obj)):
+            raise PermissionError("Object permission denied")
+
+    def get_audit_log(self) -> AuditLog | None:
+        # Can be overridden
+        return self.audit_log
+
+    def get_audit_record(self, permission: Any, decision: Decision) -> AuditRecord:
+        # Can be overridden
+        return AuditRecord(
+            timestamp=time.time(),
+            view=type(self).__name__,
+            method=method(),
+            permission=permission_name(decision.permission or permission),
+            outcome=GRANTED if decision else DENIED,
+            reason=decision.reason,
+        )
+
+    def get_permission_denied(self, decision: Decision) -> HTTPException:
+        # Can be overridden
+        for leaf in decision.leaves():
+            if isinstance(leaf.error, RateLimitExceeded):
+                return leaf.error.to_http_exception()
+        return PermissionDenied(decision)
+
+    def check_permissions(self):
+        audit_log = self.get_audit_log()
         for permission in self.get_permissions():
-            permission().check_permission()
+            check_deadline(self)
+            permission = permission()
+            decision = decide(permission)
+
+            if audit_log is not None and (self.audit_grants or not decision):
+                audit_log.record(self.get_audit_record(permission, decision))
+
+            if not decision:
+                errors = [
+                    leaf.error for leaf in decision.leaves() if leaf.error is not None
+                ]
+                if errors and not any(
+                    isinstance(error, RateLimitExceeded) for error in errors
+                ):
+                    # The permissions raising their own errors raise as they used to
+                    raise errors[0]
+                raise self.get_permission_denied(decision)
+
+    def dispatch_request(self, *args, **kwargs) -> Any:
+        # Unless an outer mixin checked them already
+        if not request_state().pop("permissions_checked", False):
+            with track_layer(PERMISSION):
+                self.check_permissions()
 
-        return super().dispatch_request(*args, **kwargs)
+        with track_layer(HANDLER):
+            return super().dispatch_request(*args, **kwargs)
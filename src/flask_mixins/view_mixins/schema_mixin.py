@@ -1,13 +1,29 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import Context, copy_context
+from itertools import chain, repeat
+from typing import TYPE_CHECKING, Any, Hashable
 
-from flask import request
 from werkzeug import Response
 
-from ._utils import method
+from ..deadline import check_deadline
+from ..dump_memo import memoize_nested_dumps
+from ..eager_loading import (
+    LoadPlan,
+    apply_load_plan,
+    get_load_plan,
+    is_sqlalchemy_query,
+)
+from ..memory import DUMP, LOAD, track_layer
+from ..prevalidation import prevalidate
+from ..raw_json import is_raw
+from ..sync import SyncResult
+from ._utils import dispatch_context, head_response, method, skip_head_body
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
     from marshmallow import Schema
 
 
@@ -45,12 +61,30 @@ class _FilterSchemaMixin:
         )
 
     def get_filter_data(self) -> dict | Any:
-        return self.get_filter_schema_instance().load(request.args.to_dict())
+        with track_layer(LOAD):
+            schema = self.get_filter_schema_instance()
+            return schema.load(dispatch_context().args.to_dict())
+
+
+def _dump_chunk(schema: Schema, chunk: list) -> list:
+    return schema.dump(chunk, many=True)
+
+
+def _dump_chunk_in_context(context: Context, schema: Schema, chunk: list) -> list:
+    return context.run(_dump_chunk, schema, chunk)
 
 
 class _ResponseSchemaMixin(_Base):
     schema = None
     response_schema = None
+    # Lists longer than the threshold are dumped in chunks on the executor
+    dump_executor: Executor | None = None
+    parallel_dump_threshold = 5000
+    parallel_dump_chunk_size = 1000
+    # Dump each distinct nested object once per response
+    memoize_nested_dumps = False
+    # Eager load the relationships of the queries returned by the handlers
+    eager_load = True
 
     def get_response_schema_class(self, *args, **kwargs) -> type[Schema]:
         # Can be overridden
@@ -78,6 +112,66 @@ class _ResponseSchemaMixin(_Base):
             **self.get_response_schema_options(),
         )
 
+    def get_dump_executor(self) -> Executor | None:
+        # Can be overridden
+        return self.dump_executor
+
+    def get_dump_memo_key(self, obj: Any) -> Hashable:
+        # Can be overridden, to use a primary key for example
+        return id(obj)
+
+    def dump_response(self, schema: Schema, obj: Any) -> Any:
+        """
+        Dump the object with the schema. Large lists are split into chunks that
+        are dumped concurrently if there is a dump executor, a process pool
+        being preferable unless the fields release the GIL. The chunks dumped by
+        threads have the app and request context (for url_for, g...), those
+        dumped by processes don't.
+        """
+        executor = self.get_dump_executor()
+        if self.memoize_nested_dumps and not isinstance(executor, ProcessPoolExecutor):
+            memoize_nested_dumps(schema, self.get_dump_memo_key)
+
+        if (
+            executor is None
+            or not isinstance(obj, list)
+            or len(obj) < self.parallel_dump_threshold
+        ):
+            return schema.dump(obj)
+
+        size = self.parallel_dump_chunk_size
+        chunks = [obj[i : i + size] for i in range(0, len(obj), size)]
+        if isinstance(executor, ProcessPoolExecutor):
+            dumps = executor.map(_dump_chunk, repeat(schema), chunks)
+        else:
+            # A copy of the context per chunk, as a context is entered by a single
+            # thread at once
+            contexts = [copy_context() for _ in chunks]
+            dumps = executor.map(
+                _dump_chunk_in_context, contexts, repeat(schema), chunks
+            )
+        return list(chain.from_iterable(dumps))
+
+    def get_load_plan(self) -> LoadPlan:
+        """The relationships traversed by the dump of the response schema"""
+        return get_load_plan(self.get_response_schema_instance())
+
+    def apply_load_plan(self, query: Any) -> Any:
+        """Eager load the relationships of the response schema in the query"""
+        return apply_load_plan(query, self.get_load_plan())
+
+    def get_sync_envelope(self, result: SyncResult, items: list) -> dict:
+        # Can be overridden
+        return {"items": items, "deleted": result.deleted, "next_token": result.token}
+
+    def _load_query(self, schema: Schema, obj: Any) -> Any:
+        if is_sqlalchemy_query(obj) and hasattr(obj, "all"):
+            # A list endpoint returning a query
+            if self.eager_load:
+                obj = apply_load_plan(obj, get_load_plan(schema))
+            return obj.all()
+        return obj
+
     @property
     def _many_response(self) -> bool:
         return self.get_response_schema_options().get("many", False)
@@ -101,13 +195,31 @@ class _ResponseSchemaMixin(_Base):
         ):
             return response
 
+        if skip_head_body(self):
+            return (head_response(), response[1]) if tuple_response else head_response()
+
+        check_deadline(self)
         schema = self.get_response_schema_instance()
 
         obj = response[0] if tuple_response else response
         should_be_many = self._many_response
         should_be_single = not should_be_many
 
-        if not isinstance(obj, dict):
+        if isinstance(obj, SyncResult):
+            if should_be_single:
+                raise RuntimeError(
+                    "View returned a sync result, but expected an individual item"
+                )
+            # Only the changes are dumped
+            changed = self._load_query(schema, obj.changed)
+            with track_layer(DUMP):
+                changed = self.dump_response(schema, changed)
+            obj = self.get_sync_envelope(obj, changed)
+
+        elif should_be_many:
+            obj = self._load_query(schema, obj)
+
+        if not isinstance(obj, dict) and not is_raw(obj):
             if should_be_single and isinstance(obj, list):
                 raise RuntimeError(
                     "View returned list, but expected an individual item"
@@ -115,7 +227,8 @@ class _ResponseSchemaMixin(_Base):
             if should_be_many and not isinstance(obj, list):
                 raise RuntimeError("View returned non-list, but expected list")
 
-            obj = schema.dump(obj)
+            with track_layer(DUMP):
+                obj = self.dump_response(schema, obj)
 
         return (obj, response[1]) if tuple_response else obj
 
@@ -123,6 +236,8 @@ class _ResponseSchemaMixin(_Base):
 class _RequestSchemaMixin:
     request_schema = None
     schema = None
+    # Reject structurally invalid payloads before the schema load
+    prevalidate = False
 
     def get_request_schema_context(self) -> dict:
         # Can be overridden
@@ -231,10 +346,14 @@ class _RequestSchemaMixin:
         return self.get_request_schema_instance()
 
     def get_validated_data(self) -> dict | Any:
-        data = request.get_json(force=True)
-        if data is not None:
-            return self._get_request_schema_instance().load(data)
-        return {}
+        with track_layer(LOAD):
+            data = dispatch_context().get_json()
+            if data is not None:
+                schema = self._get_request_schema_instance()
+                if self.prevalidate:
+                    prevalidate(schema, data)
+                return schema.load(data)
+            return {}
 
 
 class SchemaMixin(_RequestSchemaMixin, _ResponseSchemaMixin, _FilterSchemaMixin):
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Tuple
+
+from flask import jsonify, url_for
+
+if TYPE_CHECKING:
+    from werkzeug import Response
+
+    from ..jobs import JobQueue
 
 
 class ServiceMixin:
     service_class = None
+    # If set, the request deadline is passed to the service with this keyword
+    service_deadline_option: str | None = None
+    # Used to offload the long running service calls
+    job_queue: JobQueue | None = None
+    job_status_endpoint: str | None = None
 
     def get_service_options(self, *args, **kwargs) -> Dict[Any, Any]:
         # Can be overridden
@@ -17,5 +29,30 @@ class ServiceMixin:
 
         service_class: type[Any] = self.service_class
         service_options = self.get_service_options(*args, **kwargs)
+        if self.service_deadline_option:
+            service_options[self.service_deadline_option] = getattr(
+                self, "deadline", None
+            )
         service_options.update(**kwargs)
         return service_class(*args, **service_options)
+
+    def get_job_queue(self) -> JobQueue:
+        # Can be overridden
+        if not self.job_queue:
+            raise RuntimeError("Unable to offload with no job_queue defined")
+
+        return self.job_queue
+
+    def offload(self, func: Callable, *args, **kwargs) -> Tuple[Response, int]:
+        """
+        Submit the call to the job queue, and respond with a 202 and the location
+        of the job status (a JobStatusView registered as `job_status_endpoint`)
+        """
+        job = self.get_job_queue().submit(func, *args, **kwargs)
+
+        response = jsonify(job.to_dict())
+        if self.job_status_endpoint:
+            response.headers["Location"] = url_for(
+                self.job_status_endpoint, job_id=job.id
+            )
+        return response, 202
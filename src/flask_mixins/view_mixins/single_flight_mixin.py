@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from flask import current_app
+
+from ._utils import dispatch_context, request_state
+
+if TYPE_CHECKING:
+    from flask.views import MethodView
+
+    from ..single_flight import SingleFlight
+
+    _Base = MethodView
+else:
+    _Base = object
+
+
+class SingleFlightMixin(_Base):
+    single_flight: SingleFlight | None = None
+    single_flight_methods = ("get",)
+    # Seconds to wait for the identical request in flight, before running anyway
+    single_flight_timeout = 5.0
+
+    def get_single_flight_identity(self) -> str | None:
+        """
+        Can be overridden to partition the shared responses, by user or by role
+        for example, so that a response is only shared with the requests that
+        are allowed to see it. None (the default) disables the coalescing.
+        """
+        return None
+
+    def get_single_flight_key(self) -> str | None:
+        context = dispatch_context()
+        if context.method not in self.single_flight_methods:
+            return None
+        if (identity := self.get_single_flight_identity()) is None:
+            return None
+
+        scope = "\0".join(
+            (
+                identity,
+                str(context.endpoint),
+                context.method,
+                repr(sorted((context.view_args or {}).items())),
+                repr(sorted(context.args.items(multi=True))),
+            )
+        )
+        return hashlib.sha256(scope.encode()).hexdigest()
+
+    def _get_single_flight_timeout(self) -> float:
+        timeout = self.single_flight_timeout
+        if (deadline := getattr(self, "deadline", None)) is not None:
+            timeout = min(timeout, deadline.remaining())
+        return max(timeout, 0)
+
+    def dispatch_request(self, *args, **kwargs):
+        """
+        Share the response of an identical request in flight (same identity, view,
+        view args and query), instead of computing it again. If the first request
+        fails, or takes longer than the timeout, the others run independently.
+        """
+        single_flight = self.single_flight
+        if single_flight is None or (key := self.get_single_flight_key()) is None:
+            return super().dispatch_request(*args, **kwargs)
+
+        if check_permissions := getattr(self, "check_permissions", None):
+            # The waiting requests don't reach the permission mixin
+            check_permissions()
+            request_state()["permissions_checked"] = True
+
+        flight, leader = single_flight.join(key)
+        if not leader:
+            if (stored := flight.wait(self._get_single_flight_timeout())) is not None:
+                return stored.to_response()
+            return super().dispatch_request(*args, **kwargs)
+
+        shared = None
+        try:
+            response = current_app.make_response(
+                super().dispatch_request(*args, **kwargs)
+            )
+            if response.status_code < 500:
+                shared = response
+        finally:
+            single_flight.land(key, flight, shared)
+        return response
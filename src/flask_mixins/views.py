@@ -1,18 +1,29 @@
 from __future__ import annotations
 
-from flask import request
+import warnings
+from typing import Any
+
+from flask import abort, has_request_context, jsonify
 from flask.views import MethodView
 
+from .jobs import COMPLETE
 from .view_mixins import (
+    DeadlineMixin,
+    IdempotencyMixin,
     JsonifyMixin,
     PermissionMixin,
     SchemaMixin,
     ServiceMixin,
+    SingleFlightMixin,
     StatusCodeMixin,
 )
+from .view_mixins._utils import method, run_with_dispatch_context
 
 
 class _BaseView(
+    IdempotencyMixin,
+    DeadlineMixin,
+    SingleFlightMixin,
     JsonifyMixin,
     ServiceMixin,
     StatusCodeMixin,
@@ -20,7 +31,20 @@ class _BaseView(
     PermissionMixin,
     MethodView,
 ):
-    pass
+    def __setattr__(self, name: str, value: Any):
+        if not self.init_every_request and has_request_context():
+            warnings.warn(
+                f"{type(self).__qualname__}.{name} is set during a request, but "
+                "the view instance is shared between requests as "
+                "init_every_request is False, use request_state() instead",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        super().__setattr__(name, value)
+
+    def dispatch_request(self, *args, **kwargs) -> Any:
+        # The request is read once, for all the mixins
+        return run_with_dispatch_context(super().dispatch_request, *args, **kwargs)
 
 
 class ResourceView(_BaseView):
@@ -29,4 +53,21 @@ class ResourceView(_BaseView):
 
 class ResourcesView(_BaseView):
     def get_response_schema_options(self) -> dict:
-        return {"many": request.method.lower() == "get"}
+        return {"many": method() in ("get", "head")}
+
+
+class JobStatusView(ResourceView):
+    """
+    Serve the status of the jobs offloaded with `ServiceMixin.offload`, and their
+    result dumped with the response schema once complete
+    """
+
+    def get(self, job_id: str):
+        job = self.get_job_queue().get(job_id)
+        if job is None:
+            abort(404)
+
+        if job.status != COMPLETE:
+            return jsonify(job.to_dict()), 200
+
+        return job.result
@@ -0,0 +1,180 @@
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from flask_mixins import (
+    AuditLog,
+    AuditRecord,
+    BasePermission,
+    FileAuditSink,
+    ResourceView,
+    SQLiteAuditSink,
+)
+from flask_mixins.audit import BLOCK
+from flask_mixins.permissions import permission_name
+
+
+class OK(BasePermission):
+    def check_permission(self):
+        return
+
+
+class KO(BasePermission):
+    def check_permission(self):
+        raise PermissionError("KO denied")
+
+
+class Other(BasePermission):
+    def check_permission(self):
+        raise PermissionError("Other denied")
+
+
+def _record(i=0):
+    return AuditRecord(
+        timestamp=i, view="View", method="get", permission="OK", outcome="granted"
+    )
+
+
+def test_permission_name():
+    assert permission_name(OK) == "OK"
+    assert permission_name(OK()) == "OK"
+    assert permission_name(OK | (KO & Other)) == "(OK | (KO & Other))"
+
+
+@pytest.mark.parametrize(
+    "permissions,audit_grants,expected",
+    [
+        ([OK], False, []),
+        ([OK], True, [("OK", "granted", None)]),
+        ([OK, KO], True, [("OK", "granted", None), ("KO", "denied", "KO denied")]),
+        ([OK & KO], False, [("KO", "denied", "KO denied")]),
+        # The first denial of an Or
+        ([Other | KO], False, [("Other", "denied", "Other denied")]),
+        ([OK | KO], True, [("(OK | KO)", "granted", None)]),
+    ],
+)
+def test_view_audit(app, schema, permissions, audit_grants, expected):
+    records = []
+    audit_log = AuditLog(records.extend)
+
+    class View(ResourceView):
+        pass
+
+    View.schema = schema
+    View.permissions = permissions
+    View.audit_log = audit_log
+    View.audit_grants = audit_grants
+    View.get = lambda self: {"hello": "world"}
+    app.add_url_rule("/", view_func=View.as_view("view"))
+
+    app.test_client().get("/")
+    audit_log.close()
+
+    assert [
+        (record.permission, record.outcome, record.reason) for record in records
+    ] == expected
+    assert all(record.view == "View" for record in records)
+    assert all(record.method == "get" for record in records)
+
+
+def test_batches_and_flush_on_close():
+    batches = []
+    audit_log = AuditLog(batches.append, batch_size=3, flush_interval=60)
+
+    for i in range(7):
+        audit_log.record(_record(i))
+    audit_log.close()
+
+    assert all(len(batch) <= 3 for batch in batches)
+    assert [record.timestamp for batch in batches for record in batch] == list(range(7))
+
+
+def test_drop_oldest_when_full():
+    release = threading.Event()
+    written = []
+
+    def sink(records):
+        release.wait()
+        written.extend(records)
+
+    audit_log = AuditLog(sink, capacity=2, batch_size=1, flush_interval=60)
+    audit_log.record(_record(0))
+    # Wait for the flush thread to take the first record
+    while audit_log._buffer:
+        pass
+
+    for i in range(1, 5):
+        audit_log.record(_record(i))
+    assert audit_log.dropped == 2
+
+    release.set()
+    audit_log.close()
+    assert [record.timestamp for record in written] == [0, 3, 4]
+
+
+def test_block_when_full():
+    audit_log = AuditLog(lambda records: None, capacity=1, overflow=BLOCK)
+    for i in range(20):
+        audit_log.record(_record(i))
+    audit_log.close()
+    assert audit_log.dropped == 0
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        AuditLog(lambda records: None, overflow="ignore")
+
+
+def test_record_after_close():
+    records = []
+    audit_log = AuditLog(records.extend)
+    audit_log.close()
+    audit_log.record(_record())
+    assert len(records) == 1
+
+
+def test_sink_errors_are_logged(caplog):
+    def sink(records):
+        raise OSError("disk full")
+
+    audit_log = AuditLog(sink)
+    audit_log.record(_record())
+    audit_log.close()
+    assert "Failed to write 1 audit records" in caplog.text
+
+
+def test_file_sink(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    audit_log = AuditLog(FileAuditSink(str(path)))
+    audit_log.record(_record(1))
+    audit_log.record(_record(2))
+    audit_log.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["timestamp"] for line in lines] == [1, 2]
+    assert lines[0]["outcome"] == "granted"
+
+
+def test_sqlite_sink(tmp_path):
+    path = str(tmp_path / "audit.db")
+    audit_log = AuditLog(SQLiteAuditSink(path))
+    audit_log.record(_record(1))
+    audit_log.close()
+
+    rows = sqlite3.connect(path).execute("SELECT * FROM audit").fetchall()
+    assert rows == [(1, "View", "get", "OK", "granted", None)]
+
+
+def test_sqlite_sink_record_after_close(tmp_path, caplog):
+    path = str(tmp_path / "audit.db")
+    audit_log = AuditLog(SQLiteAuditSink(path))
+    audit_log.record(_record(1))
+    audit_log.close()
+    audit_log.record(_record(2))
+    audit_log.sink.close()
+
+    assert "Failed to write" not in caplog.text
+    rows = sqlite3.connect(path).execute("SELECT timestamp FROM audit").fetchall()
+    assert rows == [(1,), (2,)]
@@ -0,0 +1,159 @@
+import time
+
+import pytest
+from flask.views import MethodView
+
+from flask_mixins import (
+    DeadlineMixin,
+    LoadSheddingMiddleware,
+    PermissionMixin,
+    ResourceView,
+)
+
+
+class _Service:
+    def __init__(self, *args, **kwargs):
+        self.kwargs = kwargs
+
+
+def test_no_deadline_by_default(app, schema):
+    class Index(ResourceView):
+        response_schema = schema
+
+        def get(self):
+            return {"deadline": self.deadline}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    response = app.test_client().get("/")
+    assert response.status_code == 200
+    assert response.get_json() == {"deadline": None}
+
+
+def test_header_shortens_view_timeout(app):
+    class Index(DeadlineMixin, MethodView):
+        timeout = 10
+
+        def get(self):
+            return {"remaining": self.deadline.remaining()}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+    assert 9 < client.get("/").get_json()["remaining"] <= 10
+    response = client.get("/", headers={"X-Request-Timeout": "2"})
+    assert 1 < response.get_json()["remaining"] <= 2
+    response = client.get("/", headers={"X-Request-Timeout": "20"})
+    assert 9 < response.get_json()["remaining"] <= 10
+
+
+def test_expired_header_aborts_before_handler(app):
+    class Index(ResourceView):
+        def get(self):
+            pytest.fail("Handler should not be called")
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    response = app.test_client().get("/", headers={"X-Request-Timeout": "0"})
+    assert response.status_code == 504
+
+
+def test_deadline_checked_between_permissions(app):
+    class SlowPermission:
+        def check_permission(self):
+            time.sleep(0.02)
+
+    class Index(DeadlineMixin, PermissionMixin, MethodView):
+        timeout = 0.01
+        permissions = (SlowPermission, SlowPermission)
+
+        def get(self):
+            pytest.fail("Handler should not be called")
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    assert app.test_client().get("/").status_code == 504
+
+
+def test_deadline_checked_before_dump(app, schema, schema_dataclass):
+    class Index(ResourceView):
+        timeout = 0.01
+        response_schema = schema
+
+        def get(self):
+            time.sleep(0.02)
+            return schema_dataclass(hello="world")
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    assert app.test_client().get("/").status_code == 504
+
+
+def test_deadline_passed_to_service(app, schema):
+    class Index(ResourceView):
+        response_schema = schema
+        timeout = 10
+        service_class = _Service
+        service_deadline_option = "deadline"
+
+        def get(self):
+            service = self.get_service()
+            return {"same": service.kwargs["deadline"] is self.deadline}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    assert app.test_client().get("/").get_json() == {"same": True}
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        ("t=1700000000.5", 1700000000.5),
+        ("1700000000500", 1700000000.5),
+        ("1700000000500000", 1700000000.5),
+        ("invalid", None),
+    ],
+)
+def test_parse_queue_start_units(header, expected):
+    assert LoadSheddingMiddleware.parse_queue_start(header) == expected
+
+
+@pytest.mark.parametrize(
+    "queue_time,headers,expected_status_code",
+    [
+        (0.1, {}, 200),
+        (2, {}, 503),
+        (0.5, {"X-Request-Timeout": "0.2"}, 503),
+        (0.1, {"X-Request-Timeout": "0.2"}, 200),
+    ],
+)
+def test_load_shedding(app, queue_time, headers, expected_status_code):
+    LoadSheddingMiddleware(app, max_queue_time=1)
+
+    @app.route("/")
+    def index():
+        return "ok"
+
+    headers["X-Request-Start"] = f"t={time.time() - queue_time}"
+    response = app.test_client().get("/", headers=headers)
+    assert response.status_code == expected_status_code
+
+
+def test_load_shedding_without_header(app):
+    LoadSheddingMiddleware(app, max_queue_time=0)
+
+    @app.route("/")
+    def index():
+        return "ok"
+
+    assert app.test_client().get("/").status_code == 200
+
+
+def test_deadline_starts_when_queued(app):
+    class Index(DeadlineMixin, MethodView):
+        timeout = 10
+
+        def get(self):
+            return {"remaining": self.deadline.remaining()}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+    queued = {"X-Request-Start": f"t={time.time() - 3}"}
+    assert 6 < client.get("/", headers=queued).get_json()["remaining"] <= 7
+
+    queued["X-Request-Timeout"] = "2"
+    assert client.get("/", headers=queued).status_code == 504
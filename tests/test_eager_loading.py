@@ -0,0 +1,170 @@
+import pytest
+from marshmallow import Schema, fields
+
+from flask_mixins import ResourcesView
+from flask_mixins.eager_loading import get_load_plan, load_paths
+
+
+class UserSchema(Schema):
+    id = fields.Int()
+    name = fields.Str()
+
+
+class TagSchema(Schema):
+    id = fields.Int()
+    name = fields.Str()
+    creator = fields.Nested(UserSchema)
+
+
+class PostSchema(Schema):
+    id = fields.Int()
+    title = fields.Str()
+    author = fields.Nested(UserSchema)
+    tags = fields.List(fields.Nested(TagSchema))
+    editor_name = fields.Pluck(UserSchema, "name", attribute="editor")
+
+
+def test_load_plan():
+    assert get_load_plan(PostSchema()) == {
+        "author": {},
+        "tags": {"creator": {}},
+        "editor": {},
+    }
+    assert sorted(load_paths(get_load_plan(PostSchema()))) == [
+        "author",
+        "editor",
+        "tags",
+        "tags.creator",
+    ]
+
+
+def test_load_plan_projection():
+    assert get_load_plan(PostSchema(only=("id", "tags.name"))) == {"tags": {}}
+    assert get_load_plan(PostSchema(exclude=("tags", "editor_name"))) == {"author": {}}
+    assert get_load_plan(UserSchema(many=True)) == {}
+
+    # The nested projections are part of the cache key
+    assert get_load_plan(PostSchema(only=("id", "tags.creator"))) == {
+        "tags": {"creator": {}}
+    }
+
+
+class NodeSchema(Schema):
+    id = fields.Int()
+    children = fields.List(fields.Nested(lambda: NodeSchema()))
+
+
+def test_load_plan_self_referencing_schema():
+    assert get_load_plan(NodeSchema()) == {"children": {}}
+
+
+@pytest.fixture
+def db():
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    from sqlalchemy import Column, ForeignKey, Integer, String, Table
+    from sqlalchemy.orm import Session, declarative_base, relationship
+
+    Base = declarative_base()
+
+    post_tags = Table(
+        "post_tags",
+        Base.metadata,
+        Column("post_id", ForeignKey("post.id")),
+        Column("tag_id", ForeignKey("tag.id")),
+    )
+
+    class User(Base):
+        __tablename__ = "user"
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+
+    class Tag(Base):
+        __tablename__ = "tag"
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        creator_id = Column(ForeignKey("user.id"))
+        creator = relationship(User)
+
+    class Post(Base):
+        __tablename__ = "post"
+        id = Column(Integer, primary_key=True)
+        title = Column(String)
+        author_id = Column(ForeignKey("user.id"))
+        editor_id = Column(ForeignKey("user.id"))
+        author = relationship(User, foreign_keys=[author_id])
+        editor = relationship(User, foreign_keys=[editor_id])
+        tags = relationship(Tag, secondary=post_tags)
+
+    engine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        users = [User(id=i, name=f"user-{i}") for i in range(20)]
+        tags = [Tag(id=i, name=f"tag-{i}", creator=users[i]) for i in range(20)]
+        session.add_all(
+            Post(
+                id=i,
+                title=f"post-{i}",
+                author=users[i],
+                editor=users[-i],
+                tags=[tags[i], tags[-i]],
+            )
+            for i in range(20)
+        )
+        session.commit()
+
+    queries = []
+    sqlalchemy.event.listen(
+        engine, "before_cursor_execute", lambda *args: queries.append(args[2])
+    )
+
+    with Session(engine) as session:
+        yield session, Post, queries
+
+
+@pytest.mark.parametrize("eager_load", [True, False])
+def test_view_eager_loads_the_returned_query(app, db, eager_load):
+    session, Post, queries = db
+
+    class Posts(ResourcesView):
+        schema = PostSchema
+
+        def get(self):
+            return session.query(Post).order_by(Post.id)
+
+    Posts.eager_load = eager_load
+    app.add_url_rule("/", view_func=Posts.as_view("posts"))
+    response = app.test_client().get("/")
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 20
+    assert response.get_json()[1]["tags"][0]["creator"] == {"id": 1, "name": "user-1"}
+    if eager_load:
+        # The users are joined, the tags (and their creator) are selected at once
+        assert len(queries) == 2
+    else:
+        assert len(queries) > 20
+
+
+def test_apply_load_plan_to_select(app, db):
+    from sqlalchemy import select
+
+    session, Post, queries = db
+
+    class Posts(ResourcesView):
+        schema = PostSchema
+
+        def get_response_schema_options(self):
+            return {"many": True, "only": ("id", "author")}
+
+        def get(self):
+            statement = self.apply_load_plan(select(Post))
+            return list(session.scalars(statement).unique())
+
+    app.add_url_rule("/", view_func=Posts.as_view("posts"))
+    response = app.test_client().get("/")
+
+    assert response.status_code == 200
+    assert response.get_json()[0] == {"id": 0, "author": {"id": 0, "name": "user-0"}}
+    # The author is joined, the tags are not loaded
+    assert len(queries) == 1
@@ -0,0 +1,181 @@
+import threading
+
+import pytest
+from flask import request
+
+from flask_mixins import MemoryIdempotencyStore, ResourcesView, SQLiteIdempotencyStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteIdempotencyStore(str(tmp_path / "idempotency.db"))
+    return MemoryIdempotencyStore()
+
+
+class _Idempotent(ResourcesView):
+    def get_idempotency_identity(self):
+        return request.headers.get("User", "")
+
+
+@pytest.fixture
+def view(schema, store):
+    class Index(_Idempotent):
+        response_schema = schema
+        idempotency_store = store
+        calls = []
+
+        def post(self):
+            self.calls.append(1)
+            return {"hello": f"world {len(self.calls)}"}
+
+    return Index
+
+
+def test_replay_without_calling_the_handler(app, view):
+    app.add_url_rule("/", view_func=view.as_view("index"))
+    client = app.test_client()
+    headers = {"Idempotency-Key": "abc"}
+
+    first = client.post("/", headers=headers)
+    second = client.post("/", headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert first.get_json() == second.get_json() == {"hello": "world 1"}
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.content_type == "application/json"
+    assert len(view.calls) == 1
+
+    assert client.post("/", headers={"Idempotency-Key": "def"}).get_json() == {
+        "hello": "world 2"
+    }
+    assert client.post("/").get_json() == {"hello": "world 3"}
+
+
+def test_keys_scoped_per_identity(app, view):
+    class Index(view):
+        def get_idempotency_identity(self):
+            return request.headers["User"]
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+
+    client.post("/", headers={"Idempotency-Key": "abc", "User": "1"})
+    response = client.post("/", headers={"Idempotency-Key": "abc", "User": "2"})
+    assert response.get_json() == {"hello": "world 2"}
+
+
+def test_server_errors_are_not_stored(app, schema, store):
+    class Index(_Idempotent):
+        response_schema = schema
+        idempotency_store = store
+        fail = True
+
+        def post(self):
+            if self.fail:
+                raise RuntimeError()
+            return {"hello": "world"}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+    headers = {"Idempotency-Key": "abc"}
+
+    assert client.post("/", headers=headers).status_code == 500
+    Index.fail = False
+    assert client.post("/", headers=headers).status_code == 201
+
+
+def test_concurrent_duplicates_are_coalesced(app, schema, store):
+    entered = threading.Event()
+    release = threading.Event()
+
+    class Index(_Idempotent):
+        response_schema = schema
+        idempotency_store = store
+        calls = []
+
+        def post(self):
+            self.calls.append(1)
+            entered.set()
+            release.wait(5)
+            return {"hello": "world"}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    headers = {"Idempotency-Key": "abc"}
+    responses = []
+
+    def post():
+        responses.append(app.test_client().post("/", headers=headers))
+
+    first = threading.Thread(target=post)
+    first.start()
+    entered.wait(5)
+    second = threading.Thread(target=post)
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert [response.status_code for response in responses] == [201, 201]
+    assert len(Index.calls) == 1
+
+
+def test_conflict_when_in_flight_too_long(app, schema, store):
+    store.acquire("in-flight")
+
+    class Index(_Idempotent):
+        response_schema = schema
+        idempotency_store = store
+        idempotency_timeout = 0.01
+
+        def get_idempotency_key(self):
+            return "in-flight"
+
+        def post(self):
+            pytest.fail("Handler should not be called")
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    assert app.test_client().post("/").status_code == 409
+
+
+def test_memory_store_is_bounded():
+    store = MemoryIdempotencyStore(max_entries=2)
+    for key in ("a", "b", "c"):
+        assert store.acquire(key)
+    assert store.acquire("a")
+    assert not store.acquire("c")
+
+
+def test_disabled_without_identity(app, schema, store):
+    class Index(ResourcesView):
+        response_schema = schema
+        idempotency_store = store
+
+        def post(self):
+            return {"hello": "world"}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+    headers = {"Idempotency-Key": "abc"}
+
+    client.post("/", headers=headers)
+    assert "Idempotent-Replayed" not in client.post("/", headers=headers).headers
+
+
+def test_key_reused_for_a_different_request(app, schema, store):
+    class Item(_Idempotent):
+        response_schema = schema
+        idempotency_store = store
+
+        def put(self, item_id):
+            return {"hello": str(item_id)}
+
+    app.add_url_rule("/<int:item_id>", view_func=Item.as_view("item"))
+    client = app.test_client()
+    headers = {"Idempotency-Key": "abc"}
+
+    assert client.put("/1", headers=headers, json={"a": 1}).status_code == 200
+    assert client.put("/1", headers=headers, json={"a": 1}).status_code == 200
+    assert client.put("/1", headers=headers, json={"a": 2}).status_code == 422
+    assert client.put("/2", headers=headers, json={"a": 1}).status_code == 422
+    assert client.put("/1?dry_run=1", headers=headers, json={"a": 1}).status_code == 422
@@ -0,0 +1,124 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from flask import current_app
+
+from flask_mixins import ExecutorJobQueue, JobStatusView, ResourcesView
+
+
+class _Service:
+    def __init__(self, release):
+        self.release = release
+
+    def create(self, hello):
+        self.release.wait(5)
+        if hello == "fail":
+            raise ValueError("Invalid hello")
+        # Run in the application context
+        return SimpleNamespace(hello=f"{hello} from {current_app.name}")
+
+
+@pytest.fixture
+def queue():
+    return ExecutorJobQueue(ThreadPoolExecutor(2))
+
+
+@pytest.fixture
+def release():
+    return threading.Event()
+
+
+@pytest.fixture
+def client(app, schema, queue, release):
+    class Index(ResourcesView):
+        request_schema = schema
+        response_schema = schema
+        service_class = _Service
+        job_queue = queue
+        job_status_endpoint = "job"
+
+        def get_service_options(self):
+            return {"release": release}
+
+        def post(self):
+            return self.offload(self.get_service().create, **self.get_validated_data())
+
+    class Job(JobStatusView):
+        response_schema = schema
+        job_queue = queue
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    app.add_url_rule("/jobs/<job_id>", view_func=Job.as_view("job"))
+    return app.test_client()
+
+
+def test_offload_returns_202_then_result(client, queue, release):
+    response = client.post("/", json={"hello": "world"})
+    assert response.status_code == 202
+    job = response.get_json()
+    assert job["status"] == "pending"
+    assert response.headers["Location"] == f"/jobs/{job['id']}"
+
+    assert client.get(response.headers["Location"]).get_json() == job
+
+    release.set()
+    queue.executor.shutdown(wait=True)
+    response = client.get(response.headers["Location"])
+    assert response.status_code == 200
+    assert response.get_json() == {"hello": "world from Test"}
+
+
+def test_offload_failed_job(client, queue, release):
+    release.set()
+    response = client.post("/", json={"hello": "fail"})
+    queue.executor.shutdown(wait=True)
+
+    response = client.get(response.headers["Location"])
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "failed"
+    assert response.get_json()["error"] == "Job failed"
+
+
+def test_failed_job_error_is_logged_and_can_be_overridden(app, caplog):
+    class Queue(ExecutorJobQueue):
+        def get_error(self, job, error):
+            return str(error)
+
+    release = threading.Event()
+    release.set()
+    queue = Queue(ThreadPoolExecutor(1))
+    with app.app_context():
+        job = queue.submit(_Service(release).create, "fail")
+    queue.executor.shutdown(wait=True)
+    assert job.status == "failed"
+    assert job.error == "Invalid hello"
+    assert "Invalid hello" in caplog.text
+
+
+def test_cancelled_job_fails(app):
+    release = threading.Event()
+    queue = ExecutorJobQueue(ThreadPoolExecutor(1))
+    with app.app_context():
+        queue.submit(release.wait, 5)
+        job = queue.submit(lambda: 1)
+    queue.executor.shutdown(wait=False, cancel_futures=True)
+    release.set()
+    queue.executor.shutdown(wait=True)
+    assert job.status == "failed"
+    assert job.error == "Job cancelled"
+
+
+def test_unknown_job(client):
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_queue_is_bounded(app):
+    queue = ExecutorJobQueue(ThreadPoolExecutor(1), max_jobs=1)
+    with app.app_context():
+        first = queue.submit(lambda: 1)
+        second = queue.submit(lambda: 2)
+    queue.executor.shutdown(wait=True)
+    assert queue.get(first.id) is None
+    assert queue.get(second.id).result == 2
@@ -76,3 +76,16 @@ def test_non_tuple_with_top_level_list_ok(app):
     assert response.status_code == 200
     assert response.is_json
     assert response.get_json() == [1, 2, 3]
+
+
+def test_head_without_body(app):
+    class Index(JsonifyMixin, MethodView):
+        def get(self):
+            return {"hello": "world"}, 201
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+    response = client.head("/")
+    assert response.status_code == 201
+    assert response.is_json
+    assert "Content-Length" not in response.headers
@@ -0,0 +1,240 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from flask.views import MethodView
+
+from flask_mixins import (
+    BasePermission,
+    ConcurrencyLimit,
+    FileLockBackend,
+    InProcessBackend,
+    PermissionMixin,
+    RateLimit,
+    RateLimitExceeded,
+    SlidingWindowRateLimit,
+)
+
+
+class _KOPermission(BasePermission):
+    def check_permission(self):
+        raise PermissionError("KO")
+
+
+@pytest.fixture(params=["memory", "file"])
+def backend(request, tmp_path):
+    if request.param == "file":
+        return FileLockBackend(str(tmp_path / "limits.json"))
+    return InProcessBackend()
+
+
+def test_rate_limit_returns_429_with_retry_after(app, backend):
+    class Limit(RateLimit):
+        limit = 2
+        period = 60
+
+    Limit.backend = backend
+
+    class Index(PermissionMixin, MethodView):
+        permissions = (Limit,)
+
+        def get(self):
+            return {"hello": "world"}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+
+    assert client.get("/").status_code == 200
+    assert client.get("/").status_code == 200
+
+    response = client.get("/")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+
+
+def test_rate_limit_refills(backend):
+    class Limit(RateLimit):
+        limit = 1
+        period = 10
+
+    Limit.backend = backend
+    limit = Limit()
+
+    with patch.object(Limit, "get_key", return_value="key"), patch(
+        "flask_mixins.limits.time.time"
+    ) as time_mock:
+        time_mock.return_value = 100
+        limit.check_permission()
+
+        with pytest.raises(RateLimitExceeded) as ctx:
+            limit.check_permission()
+        assert ctx.value.retry_after == 10
+
+        time_mock.return_value = 110
+        limit.check_permission()
+
+
+def test_sliding_window_rate_limit(backend):
+    class Limit(SlidingWindowRateLimit):
+        limit = 2
+        period = 10
+
+    Limit.backend = backend
+    limit = Limit()
+
+    with patch.object(Limit, "get_key", return_value="key"), patch(
+        "flask_mixins.limits.time.time"
+    ) as time_mock:
+        time_mock.return_value = 105
+        limit.check_permission()
+        limit.check_permission()
+
+        with pytest.raises(RateLimitExceeded) as ctx:
+            limit.check_permission()
+        assert ctx.value.retry_after == 5
+
+        # Half of the previous window is still counted
+        time_mock.return_value = 115
+        limit.check_permission()
+        with pytest.raises(RateLimitExceeded):
+            limit.check_permission()
+
+        time_mock.return_value = 125
+        limit.check_permission()
+
+
+def test_rate_limit_composes_with_permissions(backend):
+    class Limit(RateLimit):
+        limit = 1
+        period = 60
+
+    Limit.backend = backend
+
+    with patch.object(Limit, "get_key", return_value="key"):
+        (Limit | _KOPermission).check_permission()
+
+        with pytest.raises(RateLimitExceeded):
+            (Limit & _KOPermission).check_permission()
+
+
+def test_concurrency_limit(app, backend):
+    class Limit(ConcurrencyLimit):
+        limit = 1
+        retry_after = 2
+
+    Limit.backend = backend
+    entered = threading.Event()
+    release = threading.Event()
+
+    class Index(PermissionMixin, MethodView):
+        permissions = (Limit,)
+
+        def get(self):
+            entered.set()
+            release.wait(5)
+            return {"hello": "world"}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    responses = []
+    thread = threading.Thread(
+        target=lambda: responses.append(app.test_client().get("/"))
+    )
+    thread.start()
+    entered.wait(5)
+
+    response = app.test_client().get("/")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+
+    release.set()
+    thread.join(5)
+    assert responses[0].status_code == 200
+
+    # The slot has been released
+    release.set()
+    assert app.test_client().get("/").status_code == 200
+
+
+def test_concurrency_limit_released_on_error(app, backend):
+    class Limit(ConcurrencyLimit):
+        limit = 1
+
+    Limit.backend = backend
+
+    class Index(PermissionMixin, MethodView):
+        permissions = (Limit,)
+
+        def get(self):
+            raise ValueError()
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    app.testing = True
+    client = app.test_client()
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            client.get("/")
+
+
+def test_limits_need_a_positive_limit():
+    with pytest.raises(ValueError):
+        RateLimit()
+
+    with pytest.raises(ValueError):
+        ConcurrencyLimit()
+
+
+def test_full_buckets_are_removed(backend):
+    class Limit(RateLimit):
+        limit = 2
+        period = 10
+
+    Limit.backend = backend
+    limit = Limit()
+
+    with patch("flask_mixins.limits.time.time") as time_mock:
+        time_mock.return_value = 100
+        for key in ("a", "b"):
+            with patch.object(Limit, "get_key", return_value=key):
+                limit.check_permission()
+                limit.check_permission()
+
+        # The buckets are full again after 10 seconds
+        time_mock.return_value = 170
+        with patch.object(Limit, "get_key", return_value="c"):
+            limit.check_permission()
+
+        if isinstance(backend, InProcessBackend):
+            states = backend._states
+        else:
+            with open(backend.path) as fp:
+                states = json.load(fp)
+        assert [key.rsplit(":", 1)[1] for key in states] == ["c"]
+
+        with patch.object(Limit, "get_key", return_value="a"):
+            limit.check_permission()
+            limit.check_permission()
+
+
+def test_concurrency_slots_of_dead_workers_expire(backend):
+    class Limit(ConcurrencyLimit):
+        limit = 1
+        lease = 60
+
+    Limit.backend = backend
+    limit = Limit()
+
+    with patch.object(Limit, "get_key", return_value="key"), patch(
+        "flask_mixins.limits.time.time"
+    ) as time_mock, patch("flask_mixins.limits.g", {}):
+        time_mock.return_value = 100
+        # The request never reaches its teardown
+        limit.check_permission()
+
+        time_mock.return_value = 150
+        with pytest.raises(RateLimitExceeded):
+            limit.check_permission()
+
+        time_mock.return_value = 161
+        limit.check_permission()
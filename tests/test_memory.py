@@ -0,0 +1,104 @@
+import logging
+import tracemalloc
+from dataclasses import dataclass
+
+import pytest
+from marshmallow import Schema, fields
+
+from flask_mixins import MemoryTrackingMiddleware, ResourcesView
+
+
+@dataclass
+class Item:
+    id: int
+    name: str
+
+
+class ItemSchema(Schema):
+    id = fields.Int()
+    name = fields.Str()
+
+
+@pytest.fixture
+def client(app):
+    class Items(ResourcesView):
+        schema = ItemSchema
+
+        def get(self):
+            return [Item(i, f"item-{i}" * 10) for i in range(2000)]
+
+        def post(self):
+            data = self.get_validated_data()
+            return Item(**data)
+
+    app.add_url_rule("/", view_func=Items.as_view("items"))
+    return app.test_client()
+
+
+def test_tracked_request(app, client):
+    tracker = MemoryTrackingMiddleware(app, trigger_token="secret")
+    client.get("/", headers={"X-Memory-Track": "1"})
+    assert tracker.report() == {}
+
+    client.get("/", headers={"X-Memory-Track": "secret"})
+    client.post(
+        "/", json={"id": 1, "name": "item"}, headers={"X-Memory-Track": "secret"}
+    )
+
+    report = tracker.report()
+    assert len(report) == 1
+    name, layers = report.popitem()
+    assert name.endswith("Items")
+    assert set(layers) == {"permission", "load", "handler", "dump", "encode"}
+    assert layers["handler"]["count"] == 2
+    assert layers["load"]["count"] == 1
+
+    # The dump of the 2000 items
+    assert layers["dump"]["peak_max"] > 100000
+    # The result of the handler is kept until the end of the request
+    assert layers["handler"]["net_mean"] > 0
+    # The handler layer includes the load layer
+    assert layers["handler"]["peak_max"] >= layers["load"]["peak_max"]
+    assert not tracemalloc.is_tracing()
+
+    tracker.reset()
+    assert tracker.report() == {}
+
+
+def test_untracked_request(app, client):
+    tracker = MemoryTrackingMiddleware(app)
+    assert client.get("/").status_code == 200
+    # The header is ignored without a token
+    client.get("/", headers={"X-Memory-Track": "1"})
+    assert tracker.report() == {}
+
+
+def test_sample_rate(app, client):
+    tracker = MemoryTrackingMiddleware(app, sample_rate=1)
+    client.get("/")
+    (layers,) = tracker.report().values()
+    assert layers["dump"]["count"] == 1
+
+
+def test_threshold(app, client, caplog):
+    MemoryTrackingMiddleware(app, sample_rate=1, threshold=200000)
+    with caplog.at_level(logging.WARNING):
+        client.post("/", json={"id": 1, "name": "item"})
+        assert not caplog.records
+        client.get("/")
+
+    assert len(caplog.records) == 1
+    assert "GET / (" in caplog.text
+    assert "Items) allocated" in caplog.text
+    assert "dump peak=" in caplog.text
+
+
+def test_threshold_per_view(app, client, caplog):
+    class Tracker(MemoryTrackingMiddleware):
+        def get_threshold(self, view_name):
+            return 10**9 if view_name.endswith("Items") else 1
+
+    Tracker(app, sample_rate=1, threshold=1)
+    with caplog.at_level(logging.WARNING):
+        client.get("/")
+    assert not caplog.records
@@ -0,0 +1,75 @@
+import pytest
+from werkzeug import Response
+
+from flask_mixins import FastPathMiddleware
+
+
+class _Middleware(FastPathMiddleware):
+    static_responses = {"/health": (200, [("Content-Type", "text/plain")], b"ok")}
+    hooks = []
+
+    def before_routing(self, environ):
+        if environ.get("HTTP_X_OVERLOADED"):
+            return 503, [("Retry-After", "1")], b""
+        if environ["PATH_INFO"] == "/cached":
+            return Response(b'{"cached": true}', mimetype="application/json")
+        return None
+
+    def before_request(self):
+        self.hooks.append("before")
+
+    def after_request(self, response):
+        self.hooks.append("after")
+        return response
+
+
+@pytest.fixture
+def client(app):
+    _Middleware.hooks = []
+    _Middleware(app)
+
+    @app.route("/")
+    def index():
+        return "index"
+
+    return app.test_client()
+
+
+def test_static_response(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.data == b"ok"
+    assert response.headers["Content-Type"] == "text/plain"
+    assert response.headers["Content-Length"] == "2"
+    assert _Middleware.hooks == []
+
+
+def test_static_response_methods(client):
+    response = client.head("/health")
+    assert response.status_code == 200
+    assert response.data == b""
+    assert response.headers["Content-Length"] == "2"
+
+    # The other methods go through flask, which has no /health route
+    assert client.post("/health").status_code == 404
+    assert _Middleware.hooks == ["before", "after"]
+
+
+def test_before_routing_tuple(client):
+    response = client.get("/", headers={"X-Overloaded": "1"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert _Middleware.hooks == []
+
+
+def test_before_routing_response(client):
+    response = client.get("/cached")
+    assert response.get_json() == {"cached": True}
+    assert _Middleware.hooks == []
+
+
+def test_other_requests_go_through_flask(client):
+    response = client.get("/")
+    assert response.data == b"index"
+    assert _Middleware.hooks == ["before", "after"]
+    assert client.get("/unknown").status_code == 404
@@ -3,7 +3,7 @@ from unittest.mock import patch
 import pytest
 from flask.views import MethodView
 
-from flask_mixins import PermissionMixin
+from flask_mixins import BasePermission, ObjectPermission, Permission, PermissionMixin
 
 NO_OP = object()
 
@@ -138,3 +138,136 @@ def test_dispatch_permission_check_ko(app):
     client = app.test_client()
     response = client.get("/")
     assert response.status_code == 500
+
+
+class _Query:
+    def __init__(self, filters=()):
+        self.filters = filters
+
+    def filter(self, *criteria):
+        return _Query(self.filters + criteria)
+
+
+class _Owned(ObjectPermission):
+    instances = 0
+
+    def __init__(self):
+        type(self).instances += 1
+
+    def query_filter(self):
+        return "owner = me"
+
+    def has_object_permission(self, obj):
+        return obj["owner"] == "me"
+
+
+class _Admin(BasePermission):
+    is_admin = False
+
+    def check_permission(self):
+        if not self.is_admin:
+            raise PermissionError()
+
+
+@pytest.mark.parametrize(
+    "is_admin,expected_filters,expected_objects",
+    [(False, ("owner = me",), [0, 2]), (True, (), [0, 1, 2, 3])],
+)
+def test_filter_permitted(is_admin, expected_filters, expected_objects):
+    class Index(PermissionMixin, MethodView):
+        object_permissions = (_Admin | _Owned,)
+
+    objects = [{"owner": "me" if i % 2 == 0 else "them"} for i in range(4)]
+    _Owned.instances = 0
+
+    with patch.object(_Admin, "is_admin", is_admin):
+        view = Index()
+        assert view.filter_permitted(_Query()).filters == expected_filters
+        filtered = view.filter_permitted(objects)
+
+    assert filtered == [objects[i] for i in expected_objects]
+    # The permissions are instantiated once per list, not per object
+    assert _Owned.instances <= 2
+
+
+def test_filter_permitted_denied():
+    class Index(PermissionMixin, MethodView):
+        object_permissions = (_Admin & _Owned,)
+
+    view = Index()
+    assert view.filter_permitted([{"owner": "me"}]) == []
+    assert view.filter_permitted(_Query()).filters == (False,)
+
+
+def test_check_object_permissions():
+    class Index(PermissionMixin, MethodView):
+        object_permissions = (_Owned,)
+
+    view = Index()
+    view.check_object_permissions({"owner": "me"})
+    with pytest.raises(PermissionError):
+        view.check_object_permissions({"owner": "them"})
+
+
+class _IsOwner(Permission):
+    error_message = "Not the owner"
+
+    def has_permission(self):
+        return False
+
+
+class _IsAdmin(Permission):
+    error_message = "Not an admin"
+
+    def has_permission(self):
+        return False
+
+
+def test_dispatch_decision_denied(app):
+    class Index(PermissionMixin, MethodView):
+        permissions = (_IsOwner | _IsAdmin,)
+
+        def get(self):
+            return {"hello": "world"}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+    response = client.get("/")
+    assert response.status_code == 403
+    assert response.get_json() == {
+        "message": "Permission denied",
+        "reasons": [
+            {"permission": "_IsOwner", "reason": "Not the owner"},
+            {"permission": "_IsAdmin", "reason": "Not an admin"},
+        ],
+    }
+
+
+class NotAuthenticated(PermissionError):
+    pass
+
+
+class _IsAuthenticated(BasePermission):
+    def check_permission(self):
+        raise NotAuthenticated("Not authenticated")
+
+
+@pytest.mark.parametrize(
+    "permission",
+    [_IsAuthenticated, _IsAuthenticated | _IsAdmin, _IsAuthenticated & _IsAdmin],
+)
+def test_dispatch_own_permission_error(app, permission):
+    class Index(PermissionMixin, MethodView):
+        permissions = (permission,)
+
+        def get(self):
+            return {"hello": "world"}
+
+    @app.errorhandler(NotAuthenticated)
+    def not_authenticated(error):
+        return {"message": str(error)}, 401
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    response = app.test_client().get("/")
+    assert response.status_code == 401
+    assert response.get_json() == {"message": "Not authenticated"}
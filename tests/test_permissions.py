@@ -1,6 +1,8 @@
+from unittest.mock import patch
+
 import pytest
 
-from flask_mixins import BasePermission
+from flask_mixins import BasePermission, ObjectPermission, Permission
 
 
 class _OKPermission(BasePermission):
@@ -89,3 +91,159 @@ def test_permissions_ko(permission, message):
         permission.check_permission()
 
     assert repr(ctx.value) == f"PermissionError('{message}')"
+
+
+class _Expression:
+    def __init__(self, sql):
+        self.sql = sql
+
+    def __or__(self, other):
+        return _Expression(f"({self.sql} OR {other.sql})")
+
+    def __and__(self, other):
+        return _Expression(f"({self.sql} AND {other.sql})")
+
+
+def _object_permission(name, predicate):
+    return type(
+        name,
+        (ObjectPermission,),
+        {
+            "query_filter": lambda self: _Expression(name),
+            "has_object_permission": lambda self, obj: predicate(obj),
+        },
+    )
+
+
+Owner = _object_permission("owner", lambda obj: obj["owner"] == "me")
+Public = _object_permission("public", lambda obj: obj["public"])
+
+
+@pytest.mark.parametrize(
+    "permission,expected",
+    [
+        (Owner, "owner"),
+        (Owner | Public, "(owner OR public)"),
+        (Owner & Public, "(owner AND public)"),
+        (Owner | (Public & OK1), "(owner OR public)"),
+        (Owner & (Public | OK1), "owner"),
+        (Owner | KO1, "owner"),
+        (Owner | (Public & KO1), "owner"),
+        (KO1 | Owner, "owner"),
+        ((Owner | Public) & OK1, "(owner OR public)"),
+        (OK1 | Owner, True),
+        (KO1 & Owner, False),
+        (KO1 | KO2, False),
+    ],
+)
+def test_query_filter_composition(permission, expected):
+    query_filter = permission().get_query_filter()
+    if isinstance(expected, bool):
+        assert query_filter is expected
+    else:
+        assert query_filter.sql == expected
+
+
+@pytest.mark.parametrize(
+    "permission,expected",
+    [
+        (Owner, [0, 1]),
+        (Owner | Public, [0, 1, 2]),
+        (Owner & Public, [0]),
+        (Owner | KO1, [0, 1]),
+        (OK1 & (Owner | Public), [0, 1, 2]),
+    ],
+)
+def test_object_predicate_composition(permission, expected):
+    objects = [
+        {"owner": "me", "public": True},
+        {"owner": "me", "public": False},
+        {"owner": "them", "public": True},
+        {"owner": "them", "public": False},
+    ]
+    predicate = permission().get_object_predicate()
+    assert [i for i, obj in enumerate(objects) if predicate(obj)] == expected
+
+
+class _Allowed(Permission):
+    error_message = "Not raised"
+
+    def has_permission(self):
+        return True
+
+
+class IsOwner(Permission):
+    error_message = "Not the owner"
+
+    def has_permission(self):
+        return False
+
+
+class IsAdmin(Permission):
+    error_message = "Not an admin"
+
+    def has_permission(self):
+        return False
+
+
+class Overridden(Permission):
+    error_message = "Not used"
+
+    def has_permission(self):
+        return True
+
+    def check_permission(self):
+        raise PermissionError("Overridden")
+
+
+@pytest.mark.parametrize(
+    "permission,report",
+    [
+        (_Allowed, []),
+        (IsOwner | _Allowed, []),
+        (IsOwner, [("IsOwner", "Not the owner")]),
+        (_Allowed & IsOwner, [("IsOwner", "Not the owner")]),
+        (
+            IsOwner | IsAdmin,
+            [("IsOwner", "Not the owner"), ("IsAdmin", "Not an admin")],
+        ),
+        (
+            (IsOwner | IsAdmin) & _Allowed,
+            [("IsOwner", "Not the owner"), ("IsAdmin", "Not an admin")],
+        ),
+        (
+            IsOwner | (_Allowed & IsAdmin),
+            [("IsOwner", "Not the owner"), ("IsAdmin", "Not an admin")],
+        ),
+        # Through check_permission
+        (KO1 | IsOwner, [("KO1", "KO1"), ("IsOwner", "Not the owner")]),
+        (Overridden, [("Overridden", "Overridden")]),
+    ],
+)
+def test_decisions(permission, report):
+    decision = permission().decide()
+    assert bool(decision) is (not report)
+    assert [(r["permission"], r["reason"]) for r in decision.report()] == [
+        tuple(r) for r in report
+    ]
+
+
+def test_decisions_do_not_raise():
+    with patch.object(
+        Permission, "check_permission", side_effect=AssertionError
+    ) as check_permission:
+        assert not (IsOwner | (IsAdmin & _Allowed))().decide()
+    check_permission.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "permission,message,leaf",
+    [
+        (IsOwner | IsAdmin, "Not the owner", IsOwner),
+        (_Allowed & IsAdmin, "Not an admin", IsAdmin),
+    ],
+)
+def test_raising_api_from_decisions(permission, message, leaf):
+    with pytest.raises(PermissionError, match=message) as error:
+        permission.check_permission()
+    assert isinstance(error.value.permission, leaf)
@@ -0,0 +1,174 @@
+import pytest
+from marshmallow import EXCLUDE, Schema, ValidationError, fields, pre_load, validate
+
+from flask_mixins import ResourcesView
+from flask_mixins.prevalidation import compile_schema, prevalidate
+
+
+class AuthorSchema(Schema):
+    name = fields.Str(required=True)
+
+
+class ItemSchema(Schema):
+    id = fields.Int(required=True)
+    name = fields.Str(data_key="title")
+    price = fields.Float(allow_none=True)
+    active = fields.Bool()
+    tags = fields.List(fields.Str(), validate=validate.Length(max=2))
+    metadata = fields.Dict()
+    author = fields.Nested(AuthorSchema)
+    reviewers = fields.Nested(AuthorSchema, many=True)
+    publisher = fields.Nested(AuthorSchema, unknown=EXCLUDE)
+    reference = fields.UUID()
+    created_at = fields.DateTime(dump_only=True)
+
+
+def _load_errors(schema, data):
+    try:
+        schema.load(data)
+    except ValidationError as e:
+        return e.messages
+    return None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [],
+        "item",
+        {},
+        {"id": True},
+        {"id": 1, "title": 1},
+        {"id": 1, "name": "unknown"},
+        {"id": 1, "created_at": "dump only"},
+        {"id": 1, "price": None, "active": []},
+        {"id": 1, "tags": "a"},
+        {"id": 1, "tags": [1, "a", "b"]},
+        {"id": 1, "tags": ["a", "b", "c"]},
+        {"id": 1, "tags": [None]},
+        {"id": 1, "metadata": []},
+        {"id": 1, "author": []},
+        {"id": 1, "author": {}},
+        {"id": 1, "author": {"name": None}},
+        {"id": 1, "reviewers": {}},
+        {"id": 1, "reviewers": [{"name": "a"}, {}, 1]},
+        {"id": 1, "publisher": {"name": 1, "age": 2}},
+        {"id": None, "title": [], "author": {"name": 1, "age": 2}},
+    ],
+)
+def test_same_errors_as_marshmallow(data):
+    schema = ItemSchema()
+    with pytest.raises(ValidationError) as ctx:
+        prevalidate(schema, data)
+    assert ctx.value.messages == _load_errors(schema, data)
+
+
+@pytest.mark.parametrize(
+    "schema,data",
+    [
+        (ItemSchema(), {"id": 1}),
+        # Values that marshmallow may convert
+        (ItemSchema(), {"id": "1", "price": "1.5", "active": "true"}),
+        (ItemSchema(partial=True), {"author": {}}),
+        (ItemSchema(partial=("id", "author.name")), {"author": {}}),
+        (ItemSchema(unknown=EXCLUDE), {"id": 1, "unknown": 1}),
+        (ItemSchema(), {"id": 1, "publisher": {"name": "a", "age": 2}}),
+        (ItemSchema(only=("name",)), {"title": "a"}),
+        (ItemSchema(many=True), [{"id": 1}, {"id": 2}]),
+    ],
+)
+def test_valid_payloads_pass(schema, data):
+    prevalidate(schema, data)
+    assert _load_errors(schema, data) is None
+
+
+def test_fields_with_their_own_errors_are_left_to_marshmallow():
+    schema = ItemSchema()
+    data = {"id": 1, "reference": 1}
+    prevalidate(schema, data)
+    assert _load_errors(schema, data) == {"reference": ["Not a valid UUID."]}
+
+
+def test_many():
+    schema = ItemSchema(many=True)
+    data = [{"id": 1}, {}]
+    with pytest.raises(ValidationError) as ctx:
+        prevalidate(schema, data)
+    assert (
+        ctx.value.messages
+        == _load_errors(schema, data)
+        == {1: {"id": ["Missing data for required field."]}}
+    )
+
+
+def test_schema_with_pre_load_is_not_checked():
+    class EnvelopeSchema(ItemSchema):
+        @pre_load
+        def unwrap(self, data, **kwargs):
+            return data["item"]
+
+    prevalidate(EnvelopeSchema(), {"item": {"id": 1}})
+
+
+def test_compiled_once_per_configuration():
+    assert compile_schema(ItemSchema()) is compile_schema(ItemSchema())
+    assert compile_schema(ItemSchema()) is not compile_schema(ItemSchema(partial=True))
+
+
+class ContactSchema(Schema):
+    name = fields.Str(required=True)
+    email = fields.Str(required=True)
+
+
+class PostSchema(Schema):
+    author = fields.Nested(ContactSchema)
+
+
+@pytest.mark.parametrize("first, second", [("name", "email"), ("email", "name")])
+def test_compiled_per_nested_projection(first, second):
+    prevalidate(PostSchema(only=(f"author.{first}",)), {"author": {first: "a"}})
+
+    schema = PostSchema(only=(f"author.{second}",))
+    data = {"author": {second: "a"}}
+    assert _load_errors(schema, data) is None
+    prevalidate(schema, data)
+
+
+class NodeSchema(Schema):
+    name = fields.Str(required=True)
+    children = fields.List(fields.Nested(lambda: NodeSchema()))
+
+
+def test_self_referencing_schema():
+    schema = NodeSchema()
+    prevalidate(schema, {"name": "a", "children": [{"name": "b", "children": []}]})
+
+    data = {"name": "a", "children": [{"name": "b", "children": [{}]}]}
+    with pytest.raises(ValidationError) as ctx:
+        prevalidate(schema, data)
+    assert ctx.value.messages == _load_errors(schema, data)
+
+
+def test_view_prevalidates_before_load(app):
+    loads = []
+
+    class CountingSchema(ItemSchema):
+        def load(self, *args, **kwargs):
+            loads.append(1)
+            return super().load(*args, **kwargs)
+
+    class Index(ResourcesView):
+        schema = CountingSchema
+        prevalidate = True
+
+        def post(self):
+            return self.get_validated_data(), 201
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+
+    assert client.post("/", json={"id": 1}).get_json() == {"id": 1}
+    assert len(loads) == 1
+
+    assert client.post("/", json={"id": []}).status_code == 500
+    assert len(loads) == 1
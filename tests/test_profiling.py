@@ -0,0 +1,75 @@
+import os
+import pstats
+import time
+
+import pytest
+
+from flask_mixins import ProfilingMiddleware, ResourcesView
+
+
+def _busy(duration):
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        pass
+
+
+@pytest.fixture
+def view(schema):
+    class Index(ResourcesView):
+        response_schema = schema
+
+        def get(self):
+            _busy(0.05)
+            return []
+
+    return Index
+
+
+def test_cprofile_with_trigger_header(app, view, tmp_path):
+    profiler = ProfilingMiddleware(app, trigger_token="secret")
+    app.add_url_rule("/", view_func=view.as_view("index"))
+    client = app.test_client()
+
+    client.get("/")
+    client.get("/", headers={"X-Profile": "1"})
+    assert profiler.stats == {}
+
+    client.get("/", headers={"X-Profile": "secret"})
+    client.get("/", headers={"X-Profile": "secret"})
+    (name,) = profiler.stats
+    assert name.endswith("Index")
+    assert profiler.stats[name].total_calls > 0
+
+    (path,) = profiler.dump(str(tmp_path))
+    assert path.endswith(".pstats")
+    functions = [func[2] for func in pstats.Stats(path).stats]
+    assert "_busy" in functions
+
+
+def test_trigger_header_disabled_without_token(app, view):
+    profiler = ProfilingMiddleware(app)
+    app.add_url_rule("/", view_func=view.as_view("index"))
+    app.test_client().get("/", headers={"X-Profile": "1"})
+    assert profiler.stats == {}
+
+
+def test_sampling_with_sample_rate(app, view, tmp_path):
+    profiler = ProfilingMiddleware(app, sample_rate=1, mode="sampling", interval=0.001)
+    app.add_url_rule("/", view_func=view.as_view("index"))
+    app.test_client().get("/")
+
+    (path,) = profiler.dump(str(tmp_path))
+    assert path.endswith(".collapsed")
+    with open(path) as fp:
+        content = fp.read()
+    assert "_busy" in content
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in content.splitlines())
+
+    profiler.reset()
+    assert profiler.dump(str(tmp_path / "empty")) == []
+    assert os.listdir(tmp_path / "empty") == []
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ProfilingMiddleware(mode="unknown")
@@ -0,0 +1,126 @@
+import json
+from dataclasses import dataclass
+
+import pytest
+from flask import jsonify as flask_jsonify
+from flask.json.provider import DefaultJSONProvider
+from flask.views import MethodView
+from marshmallow import Schema, fields
+
+from flask_mixins import JsonifyMixin, RawJSON, RawJSONField, ResourcesView
+from flask_mixins.raw_json import dumps, jsonify
+
+BLOB = '{"b": [1, 2.50, "x"],   "a": null}'
+
+
+@pytest.mark.parametrize(
+    "obj,expected",
+    [
+        (RawJSON(BLOB), BLOB),
+        (RawJSON(BLOB.encode()), BLOB),
+        ([RawJSON("1"), RawJSON("[]")], "[1,[]]"),
+        ({"data": {"items": [RawJSON(BLOB)]}}, '{"data":{"items":[%s]}}' % BLOB),
+        ({"name": "__flask_mixins_raw_json_0", "raw": RawJSON("true")}, None),
+    ],
+)
+def test_dumps(app, obj, expected):
+    with app.app_context():
+        text = dumps(obj, separators=(",", ":"))
+    if expected is not None:
+        assert text == expected
+    else:
+        assert json.loads(text) == {"name": "__flask_mixins_raw_json_0", "raw": True}
+
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_jsonify_matches_flask(app, debug):
+    app.debug = debug
+    data = {"b": [1, {"c": "d"}], "a": "é"}
+    with app.test_request_context():
+        assert jsonify(data).get_data() == flask_jsonify(data).get_data()
+
+
+def test_jsonify_mixin(app):
+    class Index(JsonifyMixin, MethodView):
+        def get(self):
+            return {"cached": RawJSON(BLOB)}, 200
+
+        def post(self):
+            return RawJSON(BLOB), 201
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+
+    response = client.get("/")
+    assert response.data == b'{"cached":%s}\n' % BLOB.encode()
+
+    response = client.post("/")
+    assert response.status_code == 201
+    assert response.is_json
+    assert response.get_json() == json.loads(BLOB)
+
+
+def test_resources_view_passthrough(app, schema):
+    class Index(ResourcesView):
+        def get(self):
+            return [RawJSON('{"hello": "world"}'), RawJSON('{"hello": "earth"}')]
+
+    Index.schema = schema
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    response = app.test_client().get("/")
+    assert response.get_json() == [{"hello": "world"}, {"hello": "earth"}]
+
+
+def test_raw_json_field(app):
+    @dataclass
+    class Document:
+        id: int
+        content: str
+
+    class DocumentSchema(Schema):
+        id = fields.Int()
+        content = RawJSONField()
+
+    class Index(ResourcesView):
+        schema = DocumentSchema
+
+        def get(self):
+            return [Document(1, BLOB), Document(2, "[1,  2]")]
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    response = app.test_client().get("/")
+    assert BLOB.encode() in response.data
+    assert response.get_json()[1] == {"id": 2, "content": [1, 2]}
+
+    assert DocumentSchema().load({"id": 1, "content": {"a": [1]}}) == {
+        "id": 1,
+        "content": '{"a": [1]}',
+    }
+
+
+def test_raw_json_field_decoded_values(app):
+    class DocumentSchema(Schema):
+        content = RawJSONField()
+
+    with app.test_request_context():
+        data = DocumentSchema(many=True).dump(
+            [{"content": {"a": [1]}}, {"content": [1]}, {"content": None}]
+        )
+        assert json.loads(jsonify(data).get_data()) == [
+            {"content": {"a": [1]}},
+            {"content": [1]},
+            {"content": None},
+        ]
+
+
+def test_jsonify_uses_the_provider_response(app):
+    class Provider(DefaultJSONProvider):
+        def response(self, *args, **kwargs):
+            response = super().response(*args, **kwargs)
+            response.headers["X-Provider"] = "yes"
+            return response
+
+    app.json = Provider(app)
+    with app.test_request_context():
+        assert jsonify({"a": 1}).headers["X-Provider"] == "yes"
+        assert jsonify({"a": RawJSON("1")}).get_data() == b'{"a":1}\n'
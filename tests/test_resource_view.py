@@ -1,6 +1,10 @@
-from flask import jsonify
+import warnings
+from unittest.mock import patch
 
-from flask_mixins import ResourceView
+import pytest
+from flask import Flask, jsonify, request
+
+from flask_mixins import ResourceView, dispatch_context, request_state
 
 
 def test_tuple_with_werkzeug_response_ok(app, schema):
@@ -59,3 +63,90 @@ def test_ok_without_status_code(app, schema, schema_dataclass):
     assert response.status_code == 200
     assert response.is_json
     assert response.get_json() == {"hello": "world"}
+
+
+def test_reused_view_instance(app, schema, schema_dataclass):
+    class Index(ResourceView):
+        init_every_request = False
+        response_schema = schema
+        timeout = 10
+        instances = 0
+
+        def __init__(self):
+            type(self).instances += 1
+            self.prefix = "hello"
+
+        def get(self):
+            request_state()["hello"] = request.args["hello"]
+            return schema_dataclass(
+                hello=f"{self.prefix} {request_state()['hello']} {bool(self.deadline)}"
+            )
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert client.get("/?hello=world").get_json() == {"hello": "hello world True"}
+        assert client.get("/?hello=earth").get_json() == {"hello": "hello earth True"}
+
+    assert Index.instances == 1
+
+
+def test_reused_view_instance_warns_on_request_state(app, schema):
+    class Index(ResourceView):
+        init_every_request = False
+        response_schema = schema
+
+        def get(self):
+            self.hello = request.args["hello"]
+            return {}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+
+    with pytest.warns(RuntimeWarning, match="Index.hello is set during a request"):
+        app.test_client().get("/?hello=world")
+
+
+def test_dispatch_context(app, schema, schema_dataclass):
+    contexts = []
+
+    @app.before_request
+    def before():
+        request_state()["before"] = True
+
+    class Index(ResourceView):
+        def post(self, item_id):
+            context = dispatch_context()
+            contexts.append(context)
+            assert context is dispatch_context()
+            assert context.method == "post"
+            assert context.endpoint == "index"
+            assert context.view_args == {"item_id": "1"}
+            assert context.args["q"] == "a"
+            assert request_state()["before"] is True
+            return schema_dataclass(**self.get_validated_data())
+
+    Index.schema = schema
+    app.add_url_rule("/<item_id>", view_func=Index.as_view("index"))
+    client = app.test_client()
+    with patch.object(Flask.request_class, "get_json", autospec=True) as get_json:
+        get_json.return_value = {"hello": "world"}
+        response = client.post("/1?q=a", json={})
+        # Cached by the context
+        assert contexts[0].get_json() == {"hello": "world"}
+        assert get_json.call_count == 1
+
+    assert response.status_code == 201
+    assert response.get_json() == {"hello": "world"}
+
+    # The context is only set during the dispatch
+    with app.test_request_context("/1", method="PUT"):
+        assert dispatch_context() is not contexts[0]
+        assert dispatch_context().method == "put"
+        # Created once per request outside of the dispatch
+        contexts.append(dispatch_context())
+        assert dispatch_context() is contexts[-1]
+
+    with app.test_request_context("/1", method="PUT"):
+        assert dispatch_context() is not contexts[-1]
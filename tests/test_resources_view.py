@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from flask import jsonify
 
 from flask_mixins import ResourcesView
@@ -63,3 +65,74 @@ def test_ok_without_status_code(app, schema, schema_dataclass):
     assert response.status_code == 200
     assert response.is_json
     assert response.get_json() == [{"hello": "world"}, {"hello": "earth"}]
+
+
+class _Deny:
+    def check_permission(self):
+        raise PermissionError()
+
+
+def test_head_skips_dump(app, schema, schema_dataclass):
+    class Index(ResourcesView):
+        response_schema = schema
+
+        def get(self):
+            return [schema_dataclass(hello="world"), schema_dataclass(hello="earth")]
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+    with patch.object(schema, "dump") as dump:
+        response = client.head("/")
+
+    dump.assert_not_called()
+    assert response.status_code == 200
+    assert response.is_json
+    assert response.data == b""
+    assert "Content-Length" not in response.headers
+
+
+def test_head_with_content_length(app, schema, schema_dataclass):
+    class Index(ResourcesView):
+        response_schema = schema
+        head_content_length = True
+
+        def get(self):
+            return [schema_dataclass(hello="world"), schema_dataclass(hello="earth")]
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    client = app.test_client()
+    response = client.head("/")
+    assert response.status_code == 200
+    assert response.data == b""
+    assert response.headers["Content-Length"] == str(len(client.get("/").data))
+
+
+def test_head_uses_get_permissions(app, schema):
+    class Index(ResourcesView):
+        response_schema = schema
+
+        def get_get_permissions(self):
+            return [_Deny]
+
+        def get(self):
+            return []
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    assert app.test_client().head("/").status_code == 500
+
+
+def test_options_skips_the_mixins(app, schema):
+    class Index(ResourcesView):
+        response_schema = schema
+        permissions = [_Deny]
+
+        def get(self):
+            return []
+
+        def post(self):
+            return {}
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    response = app.test_client().options("/")
+    assert response.status_code == 200
+    assert set(response.allow) == {"GET", "HEAD", "OPTIONS", "POST"}
@@ -0,0 +1,143 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import url_for
+from marshmallow import Schema, fields
+
+from flask_mixins import ResourcesView
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self.chunks = []
+
+    def map(self, func, *iterables):
+        *others, chunks = iterables
+        chunks = list(chunks)
+        self.chunks.extend(len(chunk) for chunk in chunks)
+        return super().map(func, *others, chunks)
+
+
+@pytest.mark.parametrize(
+    "count,expected_chunks",
+    [(9, []), (10, [4, 4, 2]), (12, [4, 4, 4])],
+)
+def test_parallel_dump_above_threshold(
+    app, schema, schema_dataclass, count, expected_chunks
+):
+    executor = _CountingExecutor()
+
+    class Index(ResourcesView):
+        response_schema = schema
+        dump_executor = executor
+        parallel_dump_threshold = 10
+        parallel_dump_chunk_size = 4
+
+        def get(self):
+            return [schema_dataclass(hello=str(i)) for i in range(count)]
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    response = app.test_client().get("/")
+    assert response.status_code == 200
+    assert response.get_json() == [{"hello": str(i)} for i in range(count)]
+    assert executor.chunks == expected_chunks
+
+
+def test_parallel_dump_has_the_request_context(app, schema_dataclass):
+    class LinkSchema(Schema):
+        hello = fields.Str()
+        url = fields.Function(lambda obj: url_for("index", q=obj.hello))
+
+    class Index(ResourcesView):
+        response_schema = LinkSchema
+        dump_executor = ThreadPoolExecutor(4)
+        parallel_dump_threshold = 2
+        parallel_dump_chunk_size = 1
+
+        def get(self):
+            return [schema_dataclass(hello=str(i)) for i in range(4)]
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    response = app.test_client().get("/")
+    assert response.status_code == 200
+    assert response.get_json() == [
+        {"hello": str(i), "url": f"/?q={i}"} for i in range(4)
+    ]
+
+
+class _Author:
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+class _Post:
+    def __init__(self, title, author, reviewers=()):
+        self.title = title
+        self.author = author
+        self.reviewers = list(reviewers)
+
+
+@pytest.fixture
+def dumps():
+    return []
+
+
+@pytest.fixture
+def post_schema(dumps):
+    class AuthorSchema(Schema):
+        name = fields.Function(lambda author: dumps.append(author.id) or author.name)
+
+    class PostSchema(Schema):
+        title = fields.Str()
+        author = fields.Nested(AuthorSchema)
+        reviewers = fields.List(fields.Nested(AuthorSchema))
+
+    return PostSchema
+
+
+@pytest.mark.parametrize(
+    "memoize,memo_key,expected_dumps",
+    [
+        # The author and reviewers fields have their own nested schema instances
+        (False, None, [1, 1, 1, 1, 1, 2]),
+        (True, None, [1, 1, 1, 1, 2]),
+        (True, lambda self, author: author.id, [1, 1, 2]),
+    ],
+)
+def test_memoize_nested_dumps(
+    app, post_schema, dumps, memoize, memo_key, expected_dumps
+):
+    author = _Author(1, "author")
+    # Same primary key, different instance
+    other = _Author(1, "author")
+    posts = [
+        _Post("a", author, [author]),
+        _Post("b", author, [_Author(2, "reviewer")]),
+        _Post("c", other, [other]),
+    ]
+
+    class Index(ResourcesView):
+        response_schema = post_schema
+        memoize_nested_dumps = memoize
+
+        def get(self):
+            return posts
+
+    if memo_key:
+        Index.get_dump_memo_key = memo_key
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    response = app.test_client().get("/")
+    assert response.get_json() == [
+        {"title": "a", "author": {"name": "author"}, "reviewers": [{"name": "author"}]},
+        {
+            "title": "b",
+            "author": {"name": "author"},
+            "reviewers": [{"name": "reviewer"}],
+        },
+        {"title": "c", "author": {"name": "author"}, "reviewers": [{"name": "author"}]},
+    ]
+    # The fields are not ordered
+    assert sorted(dumps) == expected_dumps
@@ -0,0 +1,164 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import request
+from werkzeug import Response
+
+from flask_mixins import ResourceView, SingleFlight
+
+
+class _Deny:
+    def check_permission(self):
+        if request.headers.get("X-Deny"):
+            raise PermissionError()
+
+
+@pytest.fixture
+def view(app, schema, schema_dataclass):
+    calls = []
+    release = threading.Event()
+    single_flight = SingleFlight()
+
+    class Index(ResourceView):
+        permissions = [_Deny]
+        single_flight_timeout = 5
+
+        def get_single_flight_identity(self):
+            return request.headers.get("X-User", "")
+
+        def get(self, item_id):
+            calls.append(item_id)
+            release.wait(5)
+            if request.args.get("fail"):
+                return {"error": "failed"}, 503
+            return schema_dataclass(hello=f"{item_id} {len(calls)}")
+
+    Index.schema = schema
+    Index.single_flight = single_flight
+    app.add_url_rule("/<item_id>", view_func=Index.as_view("index"))
+    return app, Index, calls, release
+
+
+def _wait_for_waiters(single_flight, count):
+    end = time.monotonic() + 5
+    while time.monotonic() < end:
+        with single_flight._lock:
+            if sum(f.waiters for f in single_flight._flights.values()) >= count:
+                return
+        time.sleep(0.001)
+    raise AssertionError("The requests did not join the flight")
+
+
+def _concurrent_gets(app, single_flight, release, requests, waiters):
+    with ThreadPoolExecutor(len(requests)) as executor:
+        futures = [
+            executor.submit(app.test_client().get, path, **kwargs)
+            for path, kwargs in requests
+        ]
+        _wait_for_waiters(single_flight, waiters)
+        release.set()
+        return [future.result() for future in futures]
+
+
+def test_identical_requests_share_the_response(view):
+    app, Index, calls, release = view
+    responses = _concurrent_gets(
+        app, Index.single_flight, release, [("/1", {})] * 5, waiters=4
+    )
+
+    assert calls == ["1"]
+    assert all(response.status_code == 200 for response in responses)
+    assert all(response.get_json() == {"hello": "1 1"} for response in responses)
+    assert not Index.single_flight._flights
+
+
+def test_identities_are_not_shared(view):
+    app, Index, calls, release = view
+    responses = _concurrent_gets(
+        app,
+        Index.single_flight,
+        release,
+        [
+            ("/1", {"headers": {"X-User": "a"}}),
+            ("/1", {"headers": {"X-User": "a"}}),
+            ("/1", {"headers": {"X-User": "b"}}),
+            ("/2", {"headers": {"X-User": "a"}}),
+        ],
+        waiters=1,
+    )
+
+    assert sorted(calls) == ["1", "1", "2"]
+    assert responses[0].get_json() == responses[1].get_json()
+
+
+def test_failed_leader_runs_the_others(view):
+    app, Index, calls, release = view
+    responses = _concurrent_gets(
+        app,
+        Index.single_flight,
+        release,
+        [("/1", {"query_string": {"fail": 1}})] * 3,
+        waiters=2,
+    )
+
+    assert len(calls) == 3
+    assert all(response.status_code == 503 for response in responses)
+
+
+def test_permissions_of_the_waiting_requests(view):
+    app, Index, calls, release = view
+    responses = _concurrent_gets(
+        app,
+        Index.single_flight,
+        release,
+        [("/1", {}), ("/1", {}), ("/1", {"headers": {"X-Deny": "1"}})],
+        waiters=1,
+    )
+
+    assert calls == ["1"]
+    assert [response.status_code for response in responses] == [200, 200, 500]
+
+
+def test_timeout(view):
+    app, Index, calls, release = view
+    Index.single_flight_timeout = 0.01
+
+    with ThreadPoolExecutor(2) as executor:
+        futures = [executor.submit(app.test_client().get, "/1") for _ in range(2)]
+        # The second request stops waiting for the first one and runs
+        end = time.monotonic() + 5
+        while len(calls) < 2 and time.monotonic() < end:
+            time.sleep(0.001)
+        release.set()
+        responses = [future.result() for future in futures]
+
+    assert calls == ["1", "1"]
+    assert {response.get_json()["hello"] for response in responses} == {"1 2"}
+
+
+def test_disabled_without_identity(view):
+    app, Index, calls, release = view
+    Index.get_single_flight_identity = lambda self: None
+    release.set()
+
+    client = app.test_client()
+    client.get("/1")
+    client.get("/1")
+    assert calls == ["1", "1"]
+
+
+def test_response_only_copied_for_waiters():
+    single_flight = SingleFlight()
+    response = Response(b'{"hello": "world"}', mimetype="application/json")
+
+    flight, leader = single_flight.join("key")
+    assert leader
+    single_flight.land("key", flight, response)
+    assert flight.response is None
+
+    flight, _ = single_flight.join("key")
+    assert single_flight.join("key") == (flight, False)
+    single_flight.land("key", flight, response)
+    assert flight.wait(0).body == b'{"hello": "world"}'
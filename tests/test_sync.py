@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+
+import pytest
+from marshmallow import Schema, ValidationError
+
+from flask_mixins import (
+    ResourcesView,
+    ResourceView,
+    SyncResult,
+    SyncToken,
+    SyncTokenExpired,
+)
+from flask_mixins.sync import decode_sync_token, encode_sync_token
+
+
+@dataclass
+class Item:
+    id: int
+    hello: str
+    version: int
+
+
+class FilterSchema(Schema):
+    since = SyncToken(load_default=None)
+
+
+ITEMS = [Item(id=i, hello=f"item-{i}", version=i) for i in range(1, 6)]
+DELETED = {2: 3}  # id: version
+
+
+def _view(schema):
+    class Items(ResourcesView):
+        filter_schema = FilterSchema
+
+        def get(self):
+            since = self.get_filter_data()["since"]
+            if since is None:
+                return SyncResult(changed=ITEMS, cursor=5)
+            if since < 1:
+                raise SyncTokenExpired()
+            return SyncResult(
+                changed=[item for item in ITEMS if item.version > since],
+                deleted=[id_ for id_, version in DELETED.items() if version > since],
+                cursor=5,
+            )
+
+    Items.schema = schema
+    return Items
+
+
+@pytest.mark.parametrize("cursor", [5, "2024-01-01T00:00:00", {"v": 1}])
+def test_token_round_trip(cursor):
+    token = encode_sync_token(cursor)
+    assert "=" not in token
+    assert decode_sync_token(token) == cursor
+    assert FilterSchema().load({"since": token}) == {"since": cursor}
+
+
+def test_invalid_token():
+    with pytest.raises(ValidationError) as error:
+        FilterSchema().load({"since": "not a token"})
+    assert error.value.messages == {"since": ["Invalid sync token."]}
+
+
+def test_full_then_delta_sync(app, schema):
+    app.add_url_rule("/", view_func=_view(schema).as_view("items"))
+    client = app.test_client()
+
+    response = client.get("/")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert len(data["items"]) == 5
+    assert data["deleted"] == []
+
+    response = client.get("/", query_string={"since": encode_sync_token(3)})
+    assert response.get_json() == {
+        "items": [{"hello": "item-4"}, {"hello": "item-5"}],
+        "deleted": [],
+        "next_token": data["next_token"],
+    }
+
+    response = client.get("/", query_string={"since": encode_sync_token(2)})
+    assert response.get_json()["deleted"] == [2]
+
+
+def test_expired_token(app, schema):
+    app.add_url_rule("/", view_func=_view(schema).as_view("items"))
+    response = app.test_client().get("/", query_string={"since": encode_sync_token(0)})
+    assert response.status_code == 410
+
+
+def test_custom_envelope(app, schema):
+    class Items(_view(schema)):
+        def get_sync_envelope(self, result, items):
+            return {"data": items, "cursor": result.token}
+
+    app.add_url_rule("/", view_func=Items.as_view("items"))
+    data = app.test_client().get("/").get_json()
+    assert set(data) == {"data", "cursor"}
+
+
+def test_sync_result_of_a_single_item_view(app, schema):
+    class Index(ResourceView):
+        def get(self):
+            return SyncResult(changed=[], cursor=1)
+
+    Index.schema = schema
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    assert app.test_client().get("/").status_code == 500
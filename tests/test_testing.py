@@ -0,0 +1,156 @@
+import pytest
+from flask import g, request, url_for
+from marshmallow import Schema, ValidationError, fields
+
+from flask_mixins import Permission, ResourcesView, ResourceView
+from flask_mixins.testing import ViewClient
+
+
+class ItemSchema(Schema):
+    id = fields.Int(required=True)
+    name = fields.Str(required=True)
+
+
+class FilterSchema(Schema):
+    name = fields.Str()
+
+
+class _HeaderPermission(Permission):
+    error_message = "Missing header"
+
+    def has_permission(self):
+        return request.headers.get("X-Allowed") == "yes"
+
+
+class Items(ResourcesView):
+    schema = ItemSchema
+    filter_schema = FilterSchema
+    permissions = (_HeaderPermission,)
+
+    def get(self):
+        items = [{"id": 1, "name": "first"}, {"id": 2, "name": "second"}]
+        if name := self.get_filter_data().get("name"):
+            items = [item for item in items if item["name"] == name]
+        return items
+
+    def post(self):
+        return self.get_validated_data()
+
+
+class CountedItems(Items):
+    head_content_length = True
+
+
+class Item(ResourceView):
+    schema = ItemSchema
+    permissions = ()
+
+    def get(self, item_id):
+        return {"id": item_id, "name": url_for("item", item_id=item_id)}
+
+    def delete(self, item_id):
+        return None
+
+
+@pytest.fixture
+def app(app):
+    app.add_url_rule("/items", view_func=Items.as_view("items"))
+    app.add_url_rule("/counted", view_func=CountedItems.as_view("counted"))
+    app.add_url_rule("/items/<int:item_id>", view_func=Item.as_view("item"))
+
+    @app.errorhandler(ValidationError)
+    def validation_error(error):
+        return {"errors": error.messages}, 400
+
+    @app.before_request
+    def before_request():
+        g.before = request.endpoint
+
+    @app.after_request
+    def after_request(response):
+        response.headers["X-Endpoint"] = g.before
+        return response
+
+    return app
+
+
+ALLOWED = {"X-Allowed": "yes"}
+
+
+@pytest.mark.parametrize(
+    "view, method, kwargs, status_code",
+    [
+        (Items, "GET", {"headers": ALLOWED}, 200),
+        (Items, "GET", {"headers": ALLOWED, "query_string": {"name": "second"}}, 200),
+        (Items, "GET", {"headers": ALLOWED, "query_string": {"unknown": "x"}}, 400),
+        (Items, "GET", {}, 403),
+        (Items, "HEAD", {"headers": ALLOWED}, 200),
+        (CountedItems, "HEAD", {"headers": ALLOWED}, 200),
+        (Items, "POST", {"headers": ALLOWED, "json": {"id": 3, "name": "third"}}, 201),
+        (Items, "POST", {"headers": ALLOWED, "json": {"id": "x"}}, 400),
+        (Items, "POST", {"json": {"id": 3, "name": "third"}}, 403),
+        (Items, "PUT", {"headers": ALLOWED}, 405),
+        (Items, "OPTIONS", {}, 200),
+    ],
+)
+def test_same_response_as_the_test_client(app, view, method, kwargs, status_code):
+    path = "/counted" if view is CountedItems else "/items"
+    expected = app.test_client().open(path, method=method, **kwargs)
+
+    kwargs["args"] = kwargs.pop("query_string", None)
+    result = ViewClient(app, view).open(method, **kwargs)
+
+    assert result.status_code == expected.status_code == status_code
+    assert result.response.get_data() == expected.get_data()
+    assert result.headers.get("X-Endpoint") == expected.headers.get("X-Endpoint")
+    # The methods are not sorted
+    assert set(result.headers.get("Allow", "").split(", ")) == set(
+        expected.headers.get("Allow", "").split(", ")
+    )
+    for header in ("Content-Type", "Content-Length"):
+        assert result.headers.get(header) == expected.headers.get(header)
+
+
+def test_view_args(app):
+    client = ViewClient(app, "item", path="/items/1")
+
+    result = client.get(view_args={"item_id": 1})
+    assert result.status_code == 200
+    assert result.json == {"id": 1, "name": "/items/1"}
+    assert result.headers["X-Endpoint"] == "item"
+
+    assert client.delete(view_args={"item_id": 1}).status_code == 204
+    assert client.post(view_args={"item_id": 1}).status_code == 405
+
+
+def test_unregistered_view(app, schema):
+    class Index(ResourceView):
+        schema = ItemSchema
+        permissions = ()
+
+        def get(self):
+            return {"id": 1, "name": request.path}
+
+    result = ViewClient(app, Index, path="/index").get()
+    assert result.json == {"id": 1, "name": "/index"}
+    assert result.headers["X-Endpoint"] == "Index"
+
+
+def test_teardown_and_errors(app):
+    teardowns = []
+    app.teardown_request(teardowns.append)
+
+    class Broken(ResourceView):
+        schema = ItemSchema
+        permissions = ()
+
+        def get(self):
+            raise ValueError()
+
+    client = ViewClient(app, Broken)
+    assert client.get().status_code == 500
+    assert isinstance(teardowns[-1], ValueError)
+
+    app.testing = True
+    with pytest.raises(ValueError):
+        client.get()